@@ -0,0 +1,4 @@
+"""
+Language extractors for codebase_analyser.py
+Each module is imported lazily, the first time a file of its language is analyzed
+"""
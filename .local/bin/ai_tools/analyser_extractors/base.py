@@ -0,0 +1,42 @@
+"""Shared regex-driven extractor"""
+
+import re
+from typing import List, Pattern, Set, Tuple
+
+
+class RegexExtractor:
+    """Extracts imports, classes and functions with one capturing regex per rule.
+
+    Subclasses list their rules; they are compiled once per process, when the
+    extractor is first loaded.
+    """
+
+    import_patterns: List[str] = []
+    class_patterns: List[str] = []
+    function_patterns: List[str] = []
+    flags = re.MULTILINE
+    # Keywords a loose signature rule can capture, e.g. "else if (" or "} catch ("
+    excluded_names: Set[str] = set()
+
+    def __init__(self):
+        self.imports = self.compile(self.import_patterns)
+        self.classes = self.compile(self.class_patterns)
+        self.functions = self.compile(self.function_patterns)
+
+    def compile(self, patterns: List[str]) -> List[Pattern]:
+        return [re.compile(pattern, self.flags) for pattern in patterns]
+
+    def findall(self, rules: List[Pattern], content: str) -> List[str]:
+        names = []
+        for rule in rules:
+            for match in rule.finditer(content):
+                name = match.group(1).strip()
+                if name and name not in self.excluded_names:
+                    names.append(name)
+        return names
+
+    def extract(self, content: str) -> Tuple[List[str], List[str], List[str]]:
+        """Return (imports, classes, functions)"""
+        return (self.findall(self.imports, content),
+                self.findall(self.classes, content),
+                self.findall(self.functions, content))
@@ -0,0 +1,14 @@
+"""C and C++ extractor"""
+
+from .base import RegexExtractor
+
+
+class CFamilyExtractor(RegexExtractor):
+    import_patterns = [r'^\s*#\s*include\s*[<"]([^>"]+)[>"]']
+    # Definitions only: forward declarations have no body
+    class_patterns = [r'\b(?:class|struct)\s+(\w+)\s*(?:final\s*)?(?::[^{;]*)?\{']
+    function_patterns = [
+        r'^[A-Za-z_][\w \t\*&:<>,]*?[ \t\*&]\**(\w+(?:::~?\w+)?)[ \t]*\([^;{)]*\)[ \t]*'
+        r'(?:const[ \t]*)?(?:noexcept[ \t]*)?(?:override[ \t]*)?\n?\{'
+    ]
+    excluded_names = {'if', 'for', 'while', 'switch', 'return', 'sizeof', 'else'}
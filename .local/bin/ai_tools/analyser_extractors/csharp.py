@@ -0,0 +1,16 @@
+"""C# extractor"""
+
+from .base import RegexExtractor
+
+
+class CSharpExtractor(RegexExtractor):
+    # Namespace imports only; "using (...)" statements and aliases are skipped
+    import_patterns = [r'^\s*(?:global\s+)?using\s+(?:static\s+)?([\w.]+)\s*;']
+    class_patterns = [r'\b(?:class|interface|struct|enum|record)\s+(\w+)']
+    function_patterns = [
+        r'^[ \t]*(?:(?:public|protected|private|internal|static|virtual|override|abstract|sealed|async|'
+        r'extern|unsafe|new|partial)[ \t]+)*[\w<>\[\]?,.]+[ \t]+(\w+)[ \t]*(?:<[^>\n]+>)?[ \t]*\([^)\n]*\)'
+        r'[ \t]*(?:\{|=>|$)'
+    ]
+    excluded_names = {'if', 'for', 'foreach', 'while', 'switch', 'catch', 'using', 'lock', 'return',
+                      'new', 'nameof', 'typeof', 'await'}
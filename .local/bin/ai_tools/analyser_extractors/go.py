@@ -0,0 +1,23 @@
+"""Go extractor"""
+
+import re
+from typing import List, Tuple
+
+from .base import RegexExtractor
+
+
+class GoExtractor(RegexExtractor):
+    import_patterns = [r'^import\s+(?:[\w.]+\s+)?"([^"]+)"']
+    class_patterns = [r'^type\s+(\w+)(?:\[[^\]\n]*\])?\s+(?:struct|interface)\b']
+    # Methods are recorded as Receiver.Name
+    function_patterns = [r'^func\s+(\w+)\s*[\[(]']
+    method_pattern = re.compile(r'^func\s+\(\s*(?:\w+\s+)?\*?(\w+)[^)]*\)\s*(\w+)\s*[\[(]', re.MULTILINE)
+    import_block = re.compile(r'^import\s*\(([^)]*)\)', re.MULTILINE)
+    quoted = re.compile(r'"([^"]+)"')
+
+    def extract(self, content: str) -> Tuple[List[str], List[str], List[str]]:
+        imports, classes, functions = super().extract(content)
+        for block in self.import_block.finditer(content):
+            imports.extend(self.quoted.findall(block.group(1)))
+        functions.extend(f"{receiver}.{name}" for receiver, name in self.method_pattern.findall(content))
+        return imports, classes, functions
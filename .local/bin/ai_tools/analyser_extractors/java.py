@@ -0,0 +1,14 @@
+"""Java extractor"""
+
+from .base import RegexExtractor
+
+
+class JavaExtractor(RegexExtractor):
+    import_patterns = [r'^\s*import\s+(?:static\s+)?([\w.]+(?:\.\*)?)\s*;']
+    class_patterns = [r'\b(?:class|interface|enum|record)\s+(\w+)']
+    # Declarations with a return type and a body on the same line
+    function_patterns = [
+        r'^[ \t]*(?:(?:public|protected|private|static|final|abstract|synchronized|native|default)[ \t]+)*'
+        r'(?:<[^>\n]+>[ \t]+)?[\w<>\[\]?,.]+[ \t]+(\w+)[ \t]*\([^)\n]*\)[ \t]*(?:throws[ \t]+[\w., \t]+)?\{'
+    ]
+    excluded_names = {'if', 'for', 'while', 'switch', 'catch', 'synchronized', 'return', 'new'}
@@ -0,0 +1,9 @@
+"""Kotlin extractor"""
+
+from .base import RegexExtractor
+
+
+class KotlinExtractor(RegexExtractor):
+    import_patterns = [r'^\s*import\s+([\w.]+(?:\.\*)?)']
+    class_patterns = [r'\b(?:class|interface|object)\s+(\w+)']
+    function_patterns = [r'\bfun\s+(?:<[^>\n]+>\s*)?(?:[\w.]+\.)?(\w+)\s*\(']
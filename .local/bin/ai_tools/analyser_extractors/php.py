@@ -0,0 +1,12 @@
+"""PHP extractor"""
+
+from .base import RegexExtractor
+
+
+class PhpExtractor(RegexExtractor):
+    import_patterns = [
+        r'^\s*use\s+([\w\\]+)',
+        r'\b(?:require|include)(?:_once)?\s*\(?\s*[\'"]([^\'"]+)[\'"]',
+    ]
+    class_patterns = [r'^\s*(?:(?:abstract|final|readonly)\s+)*(?:class|interface|trait|enum)\s+(\w+)']
+    function_patterns = [r'\bfunction\s+&?\s*(\w+)\s*\(']
@@ -0,0 +1,9 @@
+"""Ruby extractor"""
+
+from .base import RegexExtractor
+
+
+class RubyExtractor(RegexExtractor):
+    import_patterns = [r'^\s*require(?:_relative)?\s*\(?\s*[\'"]([^\'"]+)[\'"]']
+    class_patterns = [r'^\s*(?:class|module)\s+([\w:]+)']
+    function_patterns = [r'^\s*def\s+(?:self\.)?([\w?!=]+|\[\]=?)']
@@ -0,0 +1,12 @@
+"""Rust extractor"""
+
+from .base import RegexExtractor
+
+
+class RustExtractor(RegexExtractor):
+    import_patterns = [
+        r'^\s*(?:pub(?:\([\w:\s]+\))?\s+)?use\s+([^;]+);',
+        r'^\s*extern\s+crate\s+(\w+)',
+    ]
+    class_patterns = [r'^\s*(?:pub(?:\([\w:\s]+\))?\s+)?(?:struct|enum|trait|union)\s+(\w+)']
+    function_patterns = [r'\bfn\s+(\w+)']
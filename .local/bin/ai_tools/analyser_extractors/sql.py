@@ -0,0 +1,18 @@
+"""SQL extractor: tables and views stand in for classes, routines for functions"""
+
+import re
+
+from .base import RegexExtractor
+
+
+class SqlExtractor(RegexExtractor):
+    flags = re.MULTILINE | re.IGNORECASE
+    import_patterns = [r'^\s*\\i[r]?\s+(\S+)']  # psql includes
+    class_patterns = [
+        r'\bcreate\s+(?:or\s+replace\s+)?(?:(?:global\s+|local\s+)?temp(?:orary)?\s+|unlogged\s+)?'
+        r'(?:table|view|materialized\s+view)\s+(?:if\s+not\s+exists\s+)?([\w.\"`\[\]]+)'
+    ]
+    function_patterns = [
+        r'\bcreate\s+(?:or\s+replace\s+)?(?:definer\s*=\s*\S+\s+)?(?:function|procedure|trigger)\s+'
+        r'(?:if\s+not\s+exists\s+)?([\w.\"`\[\]]+)'
+    ]
@@ -0,0 +1,11 @@
+"""Swift extractor"""
+
+from .base import RegexExtractor
+
+
+class SwiftExtractor(RegexExtractor):
+    import_patterns = [r'^\s*(?:@\w+\s+)?import\s+(?:(?:class|struct|enum|protocol|func|var|let|typealias)\s+)?([\w.]+)']
+    class_patterns = [r'\b(?:class|struct|enum|protocol|actor|extension)\s+(\w+)']
+    function_patterns = [r'\bfunc\s+(\w+)']
+    # "class func" and "class var" declare type members, not classes
+    excluded_names = {'func', 'var', 'let'}
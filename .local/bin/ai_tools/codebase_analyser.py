@@ -5,31 +5,103 @@ Designed to create resumable context for AI code generation and feature addition
 """
 
 import os
+import sys
+import stat
 import json
 import ast
 import re
 import hashlib
-from typing import Dict, List, Set, Optional, Tuple
+import mmap
+import heapq
+import fnmatch
+import posixpath
+import subprocess
+import sqlite3
+import importlib
+from typing import Callable, Dict, List, Set, Optional, Sequence, Tuple, Iterator, Union
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import argparse
+import contextlib
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from collections import deque
 
 @dataclass
 class FileInfo:
-    """Information about a single file"""
+    """Information about a single file.
+
+    Slotted, with interned language/file_type strings and tuple-backed symbol
+    lists, so very large analyses stay compact in memory.
+    """
+    __slots__ = ('path', 'size', 'lines', 'file_type', 'language', 'imports', 'classes',
+                 'functions', 'exports', 'decorators', 'function_complexity', 'key_patterns',
+                 'complexity_score', 'last_modified', 'fast_path')
+    
     path: str
     size: int
     lines: int
     file_type: str
     language: str
-    imports: List[str]
-    classes: List[str]
-    functions: List[str]
-    exports: List[str]
-    key_patterns: List[str]
+    imports: Tuple[str, ...]
+    classes: Tuple[str, ...]
+    functions: Tuple[str, ...]
+    exports: Tuple[str, ...]
+    decorators: Tuple[str, ...]
+    function_complexity: Dict[str, int]  # Cyclomatic complexity by qualified function name
+    key_patterns: Tuple[str, ...]
     complexity_score: int
     last_modified: str
+    fast_path: bool  # Sampled cheap analysis for huge, minified or over-budget files
+
+    def __post_init__(self):
+        self.file_type = sys.intern(self.file_type)
+        self.language = sys.intern(self.language)
+        self.imports = tuple(self.imports)
+        self.classes = tuple(self.classes)
+        self.functions = tuple(self.functions)
+        self.exports = tuple(self.exports)
+        self.decorators = tuple(self.decorators)
+        self.key_patterns = tuple(self.key_patterns)
+
+    def __reduce__(self):
+        # Rebuild through __init__ so strings are re-interned after crossing a process boundary
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+    def to_dict(self) -> Dict:
+        """Shallow field mapping; cheaper than dataclasses.asdict's recursive copy"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_json(self, indent: Optional[int] = None, level: int = 0) -> str:
+        """Serialize directly from the object.
+
+        With an indent, the output is byte-identical to json.dumps(..., indent=indent)
+        nested at the given level, but uses the C encoder for every scalar instead of
+        json's pure-Python indenting encoder.
+        """
+        if indent is None:
+            return json.dumps(self.to_dict())
+        
+        inner = ' ' * (indent * (level + 1))
+        item = ' ' * (indent * (level + 2))
+        fields = []
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, tuple):
+                if value:
+                    values = f",\n{item}".join(json.dumps(v) for v in value)
+                    encoded = f"[\n{item}{values}\n{inner}]"
+                else:
+                    encoded = "[]"
+            elif isinstance(value, dict):
+                # Nested indentation is the flat output shifted right by this field's level
+                encoded = json.dumps(value, indent=indent).replace('\n', '\n' + inner)
+            else:
+                encoded = json.dumps(value)
+            fields.append(f'{inner}"{name}": {encoded}')
+        closing = ' ' * (indent * level)
+        return "{\n" + ",\n".join(fields) + f"\n{closing}}}"
 
 @dataclass
 class ProjectStructure:
@@ -60,13 +132,1307 @@ class ResumableContext:
     analysis_timestamp: str
     progress_markers: Dict[str, bool]
 
+@dataclass
+class RepositoryScan:
+    """Everything discovered during the single directory walk"""
+    code_files: List[Path]
+    config_files: List[str]
+    documentation: List[str]
+    entry_points: List[str]
+    code_sizes: Dict[Path, int]  # Walk-time stat sizes, used to schedule the largest files first
+    code_mtimes: Dict[Path, int]  # Walk-time mtimes (ns), used by watch mode to spot edits
+
+@dataclass
+class LoadedFile:
+    """Output of the I/O stage: everything the CPU-side extractors need from disk"""
+    stat_info: os.stat_result
+    content: str
+    content_hash: str
+    lines: int
+    fast_path: bool
+    timings: Optional[Dict[str, float]] = None
+
+class PrefetchReader:
+    """Keeps up to `depth` file loads in flight on a thread pool and hands them out in order.
+
+    On network filesystems open/read are latency-bound, so overlapping them hides
+    round trips; the bounded queue of futures applies backpressure so at most
+    `depth` loaded files are held in memory ahead of the extractors.
+    """
+    
+    def __init__(self, load: Callable[[Path], Optional[LoadedFile]], threads: int, depth: int):
+        self.load = load
+        self.threads = threads
+        self.depth = max(1, depth)
+
+    def read(self, file_paths: List[Path]) -> Iterator[Tuple[Path, 'Future']]:
+        """Yield (path, future) pairs in input order, refilling the queue as each is taken"""
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            queue = deque()
+            remaining = iter(file_paths)
+            for file_path in remaining:
+                queue.append((file_path, pool.submit(self.load, file_path)))
+                if len(queue) >= self.depth:
+                    break
+            
+            while queue:
+                file_path, future = queue.popleft()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    queue.append((next_path, pool.submit(self.load, next_path)))
+                yield file_path, future
+
+@dataclass
+class FileAnalysisResult:
+    """Outcome of analysing one file, as returned from serial or pooled workers"""
+    file_info: Optional[FileInfo]
+    frameworks: List[str]
+    content_hash: str = ''
+    timings: Optional[Dict[str, float]] = None
+    imports: Optional[List[str]] = None  # Full import list when FileInfo's copy was truncated
+    copied: bool = False  # Filled in from a byte-identical file analysed in the same run
+
+class AnalysisCache:
+    """Persistent per-file cache keyed by path, (mtime, size) and content hash"""
+    
+    CACHE_VERSION = 7
+    CACHE_FILE = 'analysis_cache.json'
+    
+    def __init__(self, output_dir: Path, root_path: str, settings: Optional[Dict] = None):
+        self.cache_path = output_dir / self.CACHE_FILE
+        self.root_path = root_path
+        # Analysis settings that change results; a cache built with different ones is discarded
+        self.settings = settings or {}
+        self.entries: Dict[str, Dict] = {}
+        self.fresh: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.removed = 0
+        self.load()
+
+    def load(self):
+        """Load cached entries, discarding caches from other versions or repositories"""
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            if (data.get('version') == self.CACHE_VERSION and data.get('root_path') == self.root_path
+                    and data.get('settings', {}) == self.settings):
+                self.entries = data.get('entries', {})
+        except Exception as e:
+            print(f"Ignoring unreadable analysis cache {self.cache_path}: {e}")
+
+    @staticmethod
+    def hash_file(file_path: Path) -> str:
+        """Compute the content hash used as the cache fallback key"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def lookup(self, rel_path: str, file_path: Path, stat_info: os.stat_result) -> Optional[FileAnalysisResult]:
+        """Return the cached result for an unchanged file, or None if it must be recomputed"""
+        entry = self.entries.get(rel_path)
+        if not entry or entry['size'] != stat_info.st_size:
+            return None
+        
+        if entry['mtime_ns'] != stat_info.st_mtime_ns:
+            # Touched but possibly unchanged (e.g. fresh checkout): fall back to the content hash
+            try:
+                if self.hash_file(file_path) != entry['content_hash']:
+                    return None
+            except OSError:
+                return None
+            entry = dict(entry, mtime_ns=stat_info.st_mtime_ns)
+            entry['file_info'] = dict(entry['file_info'],
+                                      last_modified=datetime.fromtimestamp(stat_info.st_mtime).isoformat())
+        
+        self.fresh[rel_path] = entry
+        return FileAnalysisResult(FileInfo(**entry['file_info']), entry['frameworks'], entry['content_hash'],
+                                  imports=entry.get('imports'))
+
+    def store(self, rel_path: str, stat_info: os.stat_result, result: FileAnalysisResult):
+        """Record a freshly computed result"""
+        if result.file_info is None or not result.content_hash:
+            return
+        self.fresh[rel_path] = {
+            'mtime_ns': stat_info.st_mtime_ns,
+            'size': stat_info.st_size,
+            'content_hash': result.content_hash,
+            'file_info': result.file_info.to_dict(),
+            'frameworks': result.frameworks
+        }
+        if result.imports is not None:
+            self.fresh[rel_path]['imports'] = result.imports
+
+    def retain(self, rel_paths: Set[str]):
+        """Carry entries over for files handled by an earlier, resumed part of the run"""
+        for rel_path in rel_paths:
+            if rel_path in self.entries:
+                self.fresh[rel_path] = self.entries[rel_path]
+
+    def advance(self):
+        """Start a new round on a long-lived cache: lookups see the entries of the last round"""
+        self.removed += len(set(self.entries) - set(self.fresh))
+        self.entries, self.fresh = self.fresh, {}
+
+    def save(self):
+        """Persist only the entries seen in this run, dropping deleted files"""
+        removed = self.removed + len(set(self.entries) - set(self.fresh))
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': self.CACHE_VERSION, 'root_path': self.root_path,
+                       'settings': self.settings, 'entries': self.fresh}, f)
+        os.replace(tmp_path, self.cache_path)
+        print(f"Cache: {self.hits} reused, {self.misses} analyzed, {removed} removed")
+
+class ContentCache:
+    """Analysis results keyed by content hash and file suffix, shared between repositories.
+
+    Identical files (vendored libraries, generated stubs) analyse to the same
+    payload wherever they live, so only the per-copy fields (path, size,
+    mtime) are filled in on a hit. Saving keeps only the entries used during
+    this session.
+    """
+    
+    CACHE_VERSION = 3
+    
+    def __init__(self, cache_path: Path, settings: Optional[Dict] = None):
+        self.cache_path = cache_path
+        self.settings = settings or {}
+        self.entries: Dict[str, Dict] = {}
+        self.fresh: Dict[str, Dict] = {}
+        self.hits = 0
+        self.load()
+
+    def load(self):
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == self.CACHE_VERSION and data.get('settings', {}) == self.settings:
+                self.entries = data.get('entries', {})
+        except Exception as e:
+            print(f"Ignoring unreadable content cache {self.cache_path}: {e}")
+
+    @staticmethod
+    def key(content_hash: str, file_path: Path) -> str:
+        # The suffix picks the language, so the same bytes under another extension analyse differently
+        return f"{content_hash}{file_path.suffix}"
+
+    def lookup(self, content_hash: str, file_path: Path, rel_path: str,
+               stat_info: os.stat_result) -> Optional[FileAnalysisResult]:
+        key = self.key(content_hash, file_path)
+        entry = self.fresh.get(key) or self.entries.get(key)
+        if not entry:
+            return None
+        self.fresh[key] = entry
+        self.hits += 1
+        file_info = FileInfo(**dict(entry['file_info'], path=rel_path, size=stat_info.st_size,
+                                    last_modified=datetime.fromtimestamp(stat_info.st_mtime).isoformat()))
+        return FileAnalysisResult(file_info, entry['frameworks'], content_hash, imports=entry.get('imports'))
+
+    def store(self, file_path: Path, result: FileAnalysisResult):
+        if result.file_info is None or not result.content_hash:
+            return
+        payload = result.file_info.to_dict()
+        for name in ('path', 'size', 'last_modified'):
+            del payload[name]
+        entry = {'file_info': payload, 'frameworks': result.frameworks}
+        if result.imports is not None:
+            entry['imports'] = result.imports
+        self.fresh[self.key(result.content_hash, file_path)] = entry
+
+    def save(self):
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': self.CACHE_VERSION, 'settings': self.settings, 'entries': self.fresh}, f)
+        os.replace(tmp_path, self.cache_path)
+        print(f"Shared content cache: {self.hits} hits, {len(self.fresh)} entries kept")
+
+class FileInfoStream:
+    """Re-iterable view over FileInfo records stored one per line (NDJSON)"""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self._handle = None
+
+    def open(self, offset: Optional[int] = None, count: int = 0):
+        """Start a fresh stream, or continue one truncated back to a checkpointed offset"""
+        if offset is None:
+            self._handle = open(self.path, 'w')
+            self.count = 0
+        else:
+            os.truncate(self.path, offset)
+            self._handle = open(self.path, 'a')
+            self.count = count
+
+    def sync(self) -> int:
+        """Flush buffered records and return the byte offset they end at"""
+        self._handle.flush()
+        return self._handle.tell()
+
+    def append(self, file_info: FileInfo):
+        """Write one record as soon as it is available"""
+        self._handle.write(file_info.to_json())
+        self._handle.write('\n')
+        self.count += 1
+        if self.count % 100 == 0:
+            self._handle.flush()
+
+    def close(self):
+        if self._handle:
+            self._handle.close()
+            self._handle = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[FileInfo]:
+        with open(self.path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield FileInfo(**json.loads(line))
+
+class AnalysisProfiler:
+    """Collects per-stage timings for the repository, each file and each language"""
+    
+    REPORT_FILE = 'timing_report.json'
+    
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.stages: Dict[str, float] = {}
+        self.file_stages: Dict[str, float] = {}
+        self.languages: Dict[str, Dict[str, float]] = {}
+        self.files_timed = 0
+        self.files_cached = 0
+        self.files_copied = 0
+        # Min-heap of (total seconds, path, language, stage timings) for the slowest files
+        self.slowest: List[Tuple[float, str, str, Dict[str, float]]] = []
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Time a repository-level stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def record_file(self, result: 'FileAnalysisResult'):
+        """Fold one file's stage timings into the totals"""
+        if result.file_info is None:
+            return
+        if result.copied:
+            self.files_copied += 1
+            return
+        if not result.timings:
+            self.files_cached += 1
+            return
+        
+        self.files_timed += 1
+        language = result.file_info.language
+        per_language = self.languages.setdefault(language, {'files': 0})
+        per_language['files'] += 1
+        for stage_name, seconds in result.timings.items():
+            self.file_stages[stage_name] = self.file_stages.get(stage_name, 0.0) + seconds
+            per_language[stage_name] = per_language.get(stage_name, 0.0) + seconds
+        
+        entry = (sum(result.timings.values()), result.file_info.path, language, result.timings)
+        if len(self.slowest) < self.top_n:
+            heapq.heappush(self.slowest, entry)
+        elif entry[0] > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def report(self) -> Dict:
+        """Machine-readable timing report"""
+        slowest = sorted(self.slowest, key=lambda e: e[0], reverse=True)
+        return {
+            'stages': self.stages,
+            'file_stages': self.file_stages,
+            'languages': self.languages,
+            'files_timed': self.files_timed,
+            'files_cached': self.files_cached,
+            'files_copied': self.files_copied,
+            'slowest_files': [
+                {'path': path, 'language': language, 'total': total, 'stages': timings}
+                for total, path, language, timings in slowest
+            ]
+        }
+
+    def print_summary(self):
+        """Human-readable breakdown of where the time went"""
+        print("\n⏱  Timing profile")
+        for name, seconds in self.stages.items():
+            print(f"  {name:<28} {seconds:8.3f}s")
+        
+        if self.file_stages:
+            print(f"  Per-file stages ({self.files_timed} files analyzed, {self.files_cached} from cache, "
+                  f"{self.files_copied} identical copies):")
+            for name, seconds in sorted(self.file_stages.items(), key=lambda x: x[1], reverse=True):
+                print(f"    {name:<26} {seconds:8.3f}s")
+        
+        for language, totals in sorted(self.languages.items()):
+            stage_total = sum(v for k, v in totals.items() if k != 'files')
+            print(f"  {language:<28} {stage_total:8.3f}s across {int(totals['files'])} files")
+        
+        if self.slowest:
+            print(f"  Slowest {len(self.slowest)} files:")
+            for total, path, language, timings in sorted(self.slowest, key=lambda e: e[0], reverse=True):
+                worst = max(timings, key=timings.get)
+                print(f"    {total:8.3f}s  {path} ({language}, mostly {worst})")
+
+class AnalysisCheckpoint:
+    """Periodic checkpoint of an in-progress analysis so interrupted runs can resume.
+
+    Processed paths and FileInfo records go to append-only files; a small JSON
+    file records how far each of them is valid together with the partial
+    aggregates, so every checkpoint costs O(interval) rather than O(files).
+    """
+    
+    CHECKPOINT_FILE = 'analysis_checkpoint.json'
+    PATHS_FILE = 'analysis_checkpoint.paths'
+    RECORDS_FILE = 'analysis_checkpoint.ndjson'
+    IMPORTS_FILE = 'analysis_checkpoint.imports'
+    HASHES_FILE = 'analysis_checkpoint.hashes'
+    
+    def __init__(self, output_dir: Path, root_path: str, interval: int, records: Optional[FileInfoStream] = None):
+        self.meta_path = output_dir / self.CHECKPOINT_FILE
+        self.paths_path = output_dir / self.PATHS_FILE
+        self.imports_path = output_dir / self.IMPORTS_FILE
+        self.hashes_path = output_dir / self.HASHES_FILE
+        self.root_path = root_path
+        self.interval = interval
+        # Records are shared with the NDJSON output when streaming, otherwise kept alongside the checkpoint
+        self.owns_records = records is None
+        self.records = records if records is not None else FileInfoStream(output_dir / self.RECORDS_FILE)
+        self.pending_paths: List[str] = []
+        self.pending_imports: List[Tuple[str, List[str]]] = []
+        self.pending_hashes: List[Tuple[str, str]] = []
+        self.paths_count = 0
+        self._paths_handle = None
+        self._imports_handle = None
+        self._hashes_handle = None
+
+    def load(self) -> Optional[Dict]:
+        """Return the last checkpoint for this repository, or None if there is nothing to resume"""
+        if not self.meta_path.exists():
+            return None
+        try:
+            with open(self.meta_path, 'r') as f:
+                state = json.load(f)
+            if state.get('root_path') != self.root_path:
+                print(f"Ignoring checkpoint for a different repository: {state.get('root_path')}")
+                return None
+            with open(self.paths_path, 'rb') as f:
+                data = f.read(state['paths_offset'])
+            state['processed'] = set(data.decode('utf-8').splitlines())
+            with open(self.imports_path, 'rb') as f:
+                data = f.read(state['imports_offset'])
+            state['imports'] = dict(json.loads(line) for line in data.decode('utf-8').splitlines())
+            with open(self.hashes_path, 'rb') as f:
+                data = f.read(state['hashes_offset'])
+            state['hashes'] = dict(line.split('\t', 1)[::-1] for line in data.decode('utf-8').splitlines())
+            return state
+        except Exception as e:
+            print(f"Ignoring unreadable checkpoint {self.meta_path}: {e}")
+            return None
+
+    def start(self, state: Optional[Dict] = None):
+        """Open the append-only logs, fresh or continuing from a loaded checkpoint"""
+        if state:
+            os.truncate(self.paths_path, state['paths_offset'])
+            self._paths_handle = open(self.paths_path, 'a', encoding='utf-8')
+            os.truncate(self.imports_path, state['imports_offset'])
+            self._imports_handle = open(self.imports_path, 'a', encoding='utf-8')
+            os.truncate(self.hashes_path, state['hashes_offset'])
+            self._hashes_handle = open(self.hashes_path, 'a', encoding='utf-8')
+            self.paths_count = len(state['processed'])
+            self.records.open(state['records_offset'], state['records_count'])
+        else:
+            self._paths_handle = open(self.paths_path, 'w', encoding='utf-8')
+            self._imports_handle = open(self.imports_path, 'w', encoding='utf-8')
+            self._hashes_handle = open(self.hashes_path, 'w', encoding='utf-8')
+            self.paths_count = 0
+            self.records.open()
+
+    def restored_files(self) -> List[FileInfo]:
+        """FileInfo records written before the checkpoint (non-streaming mode)"""
+        return list(self.records)
+
+    def record(self, rel_path: str, file_info: Optional[FileInfo], imports: Optional[List[str]] = None,
+               content_hash: str = ''):
+        """Note a processed path, its record, its content hash and any imports FileInfo had to truncate"""
+        self.pending_paths.append(rel_path)
+        if file_info and self.owns_records:
+            self.records.append(file_info)
+        if file_info and imports is not None:
+            self.pending_imports.append((file_info.path, imports))
+        if file_info and content_hash:
+            self.pending_hashes.append((file_info.path, content_hash))
+
+    def due(self) -> bool:
+        return len(self.pending_paths) >= self.interval
+
+    def save(self, languages: Dict[str, int], total_lines: int, frameworks: Set[str]):
+        """Persist processed paths, records and partial aggregates"""
+        for rel_path in self.pending_paths:
+            self._paths_handle.write(rel_path + '\n')
+        self.paths_count += len(self.pending_paths)
+        self.pending_paths = []
+        self._paths_handle.flush()
+        for entry in self.pending_imports:
+            self._imports_handle.write(json.dumps(entry) + '\n')
+        self.pending_imports = []
+        self._imports_handle.flush()
+        for path, content_hash in self.pending_hashes:
+            self._hashes_handle.write(f"{content_hash}\t{path}\n")
+        self.pending_hashes = []
+        self._hashes_handle.flush()
+        
+        state = {
+            'root_path': self.root_path,
+            'paths_offset': self._paths_handle.tell(),
+            'paths_count': self.paths_count,
+            'imports_offset': self._imports_handle.tell(),
+            'hashes_offset': self._hashes_handle.tell(),
+            'records_offset': self.records.sync(),
+            'records_count': len(self.records),
+            'languages': languages,
+            'total_lines': total_lines,
+            'frameworks': sorted(frameworks),
+            'saved_at': datetime.now().isoformat()
+        }
+        tmp_path = self.meta_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def close(self):
+        if self._paths_handle:
+            self._paths_handle.close()
+            self._paths_handle = None
+        if self._imports_handle:
+            self._imports_handle.close()
+            self._imports_handle = None
+        if self._hashes_handle:
+            self._hashes_handle.close()
+            self._hashes_handle = None
+        if self.owns_records:
+            self.records.close()
+
+    def clear(self):
+        """Remove checkpoint files after a completed run"""
+        self.close()
+        for path in (self.meta_path, self.paths_path, self.imports_path, self.hashes_path,
+                     self.records.path if self.owns_records else None):
+            if path and path.exists():
+                path.unlink()
+
+class IgnoreRules:
+    """Compiled ignore rules: built-in names and globs plus .gitignore patterns"""
+    
+    def __init__(self, ignore_patterns: Set[str]):
+        self.ignore_names = {p for p in ignore_patterns if not any(c in p for c in '*?[')}
+        globs = [fnmatch.translate(p) for p in ignore_patterns if p not in self.ignore_names]
+        self.ignore_glob = re.compile('|'.join(globs)) if globs else None
+        # (base directory relative to the repo, compiled regex, negated, directory-only, anchored)
+        self.gitignore_rules: List[Tuple[str, re.Pattern, bool, bool, bool]] = []
+
+    @staticmethod
+    def translate_gitignore(pattern: str) -> str:
+        """Translate a gitignore glob into a regular expression"""
+        i, n, out = 0, len(pattern), []
+        while i < n:
+            c = pattern[i]
+            if pattern.startswith('**/', i):
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern.startswith('**', i):
+                out.append('.*')
+                i += 2
+                continue
+            if c == '*':
+                out.append('[^/]*')
+            elif c == '?':
+                out.append('[^/]')
+            elif c == '[':
+                end = pattern.find(']', i + 1)
+                if end == -1:
+                    out.append(re.escape(c))
+                else:
+                    body = pattern[i + 1:end].replace('\\', '\\\\')
+                    if body.startswith('!'):
+                        body = '^' + body[1:]
+                    out.append(f'[{body}]')
+                    i = end
+            else:
+                out.append(re.escape(c))
+            i += 1
+        return ''.join(out) + r'\Z'
+
+    def add_gitignore(self, gitignore_path: Path, base: str):
+        """Load the rules of a .gitignore located in the repo-relative directory `base`"""
+        try:
+            with open(gitignore_path, 'r', encoding='utf-8', errors='ignore') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            line = line.replace('\\#', '#').replace('\\!', '!')
+            dir_only = line.endswith('/')
+            line = line.strip('/') if dir_only else line
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if not line:
+                continue
+            self.gitignore_rules.append(
+                (base, re.compile(self.translate_gitignore(line)), negate, dir_only, anchored))
+
+    def is_ignored(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        """Check a repo-relative path (using '/' separators) against all rules"""
+        if name.startswith('.') or name in self.ignore_names:
+            return True
+        if self.ignore_glob and self.ignore_glob.match(name):
+            return True
+        
+        ignored = False
+        for base, regex, negate, dir_only, anchored in self.gitignore_rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + '/'):
+                    continue
+                target = rel_path[len(base) + 1:]
+            else:
+                target = rel_path
+            if regex.match(target if anchored else name):
+                ignored = not negate
+        return ignored
+
+class PatternEngine:
+    """Regex rules compiled once per analyzer and shared by every extractor.
+
+    Rules are registered in named groups. Case-insensitive rules are run
+    case-sensitively against a lowercased copy of the content, built once per
+    buffer, so they keep sre's fast literal-prefix search. Rules may declare a
+    required literal that is checked with a plain substring test before the
+    regex runs at all.
+    """
+    
+    # Escapes whose meaning changes when lowercased
+    UNSAFE_LOWER = re.compile(r'\\[WSDBAZ]|\\[pPN]|\(\?P')
+    
+    def __init__(self):
+        # group -> [(compiled, required literal, run on lowered buffer)]
+        self.groups: Dict[str, List[Tuple[re.Pattern, Optional[str], bool]]] = {}
+        self._buffer: Optional[str] = None
+        self._lowered: Optional[str] = None
+
+    def add(self, group: str, patterns: List, flags: int = 0):
+        """Compile patterns, given as strings or (pattern, required literal) tuples, into a group"""
+        rules = self.groups.setdefault(group, [])
+        for entry in patterns:
+            pattern, required = entry if isinstance(entry, tuple) else (entry, None)
+            lowered = bool(flags & re.IGNORECASE) and not self.UNSAFE_LOWER.search(pattern)
+            if lowered:
+                compiled = re.compile(pattern.lower(), flags & ~re.IGNORECASE)
+                required = required.lower() if required else None
+            else:
+                compiled = re.compile(pattern, flags)
+            rules.append((compiled, required, lowered))
+
+    def _text_for(self, content: str, lowered: bool) -> str:
+        if not lowered:
+            return content
+        if self._buffer is not content:
+            self._buffer = content
+            self._lowered = content.lower()
+        return self._lowered
+
+    def findall(self, group: str, content: str) -> List[List]:
+        """Return the re.findall captures of every rule in the group, in rule order"""
+        results = []
+        for compiled, required, lowered in self.groups[group]:
+            text = self._text_for(content, lowered)
+            if required and required not in text:
+                results.append([])
+            elif lowered:
+                results.append(self._findall_original(compiled, text, content))
+            else:
+                results.append(compiled.findall(text))
+        return results
+
+    @staticmethod
+    def _findall_original(compiled: re.Pattern, lowered: str, content: str) -> List:
+        """findall over the lowered buffer, with captures sliced from the original text"""
+        if len(lowered) != len(content):
+            # Some characters change length when lowercased; spans would not line up
+            return re.findall(compiled.pattern, content, compiled.flags | re.IGNORECASE)
+        
+        results = []
+        for match in compiled.finditer(lowered):
+            spans = [match.span(i) for i in range(1, compiled.groups + 1)]
+            captures = [content[start:end] if start >= 0 else '' for start, end in spans]
+            if compiled.groups == 0:
+                results.append(content[match.start():match.end()])
+            elif compiled.groups == 1:
+                results.append(captures[0])
+            else:
+                results.append(tuple(captures))
+        return results
+
+    def count(self, group: str, content: str) -> int:
+        """Total number of non-overlapping matches across all rules in the group"""
+        total = 0
+        for compiled, required, lowered in self.groups[group]:
+            text = self._text_for(content, lowered)
+            if required and required not in text:
+                continue
+            total += sum(1 for _ in compiled.finditer(text))
+        return total
+
+    def search_any(self, group: str, content: str) -> bool:
+        """True if any rule in the group matches the content"""
+        for compiled, required, lowered in self.groups[group]:
+            text = self._text_for(content, lowered)
+            if required and required not in text:
+                continue
+            if compiled.search(text):
+                return True
+        return False
+
+class ExtractorRegistry:
+    """Language extractors keyed by the language names in code_extensions.
+
+    Entries are 'module:Class' specs imported on first use, so startup stays
+    fast and each worker process loads only the extractors its files need.
+    Every entry declares a cost class that the scheduler uses to balance work;
+    a spec of None marks a language handled by the analyzer's built-in
+    extract_* methods.
+    """
+    
+    COST_WEIGHTS = {'light': 1, 'medium': 2, 'heavy': 4}
+    
+    BUILTIN = {
+        'python': (None, 'heavy'),  # Full AST parse
+        'javascript': (None, 'medium'),
+        'typescript': (None, 'medium'),
+        'react': (None, 'medium'),
+        'java': ('analyser_extractors.java:JavaExtractor', 'light'),
+        'kotlin': ('analyser_extractors.kotlin:KotlinExtractor', 'light'),
+        'go': ('analyser_extractors.go:GoExtractor', 'light'),
+        'rust': ('analyser_extractors.rust:RustExtractor', 'light'),
+        'csharp': ('analyser_extractors.csharp:CSharpExtractor', 'light'),
+        'c': ('analyser_extractors.c_family:CFamilyExtractor', 'medium'),
+        'cpp': ('analyser_extractors.c_family:CFamilyExtractor', 'medium'),
+        'php': ('analyser_extractors.php:PhpExtractor', 'light'),
+        'ruby': ('analyser_extractors.ruby:RubyExtractor', 'light'),
+        'swift': ('analyser_extractors.swift:SwiftExtractor', 'light'),
+        'sql': ('analyser_extractors.sql:SqlExtractor', 'light'),
+    }
+    
+    def __init__(self):
+        self.entries: Dict[str, Tuple[Optional[str], str]] = dict(self.BUILTIN)
+        self._loaded: Dict[str, object] = {}
+
+    def __getstate__(self):
+        # Loaded extractors stay in their process; workers import their own on first use
+        return {'entries': self.entries, '_loaded': {}}
+
+    def register(self, language: str, spec: Optional[str], cost: str = 'light'):
+        if cost not in self.COST_WEIGHTS:
+            raise ValueError(f"unknown cost class '{cost}' (expected one of {', '.join(self.COST_WEIGHTS)})")
+        if spec is not None and ':' not in spec:
+            raise ValueError(f"extractor spec '{spec}' must look like module:Class")
+        self.entries[language] = (spec, cost)
+        self._loaded.pop(language, None)
+
+    def settings(self) -> Dict[str, Optional[str]]:
+        """Extractor spec per language, for the caches to tell results of other extractors apart"""
+        return {language: spec for language, (spec, _) in sorted(self.entries.items())}
+
+    def weight(self, language: str) -> int:
+        """Relative cost of analysing one file of the language"""
+        entry = self.entries.get(language)
+        return self.COST_WEIGHTS[entry[1]] if entry else self.COST_WEIGHTS['light']
+
+    def get(self, language: str):
+        """The extractor instance for a language, importing it on first use; None if there is none"""
+        if language in self._loaded:
+            return self._loaded[language]
+        
+        extractor = None
+        spec = self.entries.get(language, (None, None))[0]
+        if spec:
+            module_name, _, class_name = spec.partition(':')
+            try:
+                # Extractors ship next to this script, which may not be on sys.path when imported
+                script_dir = str(Path(__file__).resolve().parent)
+                if script_dir not in sys.path:
+                    sys.path.append(script_dir)
+                extractor = getattr(importlib.import_module(module_name), class_name)()
+            except Exception as e:
+                print(f"Extractor {spec} for {language} is unavailable: {e}")
+        self._loaded[language] = extractor
+        return extractor
+
+class DependencyGraph:
+    """Import graph between the files of a repository.
+
+    Imports are resolved against an index of Python module names and file
+    paths built once from the analysed files, so resolution never probes the
+    filesystem; results are memoised per importing package or directory.
+    """
+    
+    JS_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs')
+    
+    def __init__(self, paths: Sequence[str]):
+        # Keys are POSIX paths; values are the paths as reported in FileInfo
+        self.files: Dict[str, str] = {Path(path).as_posix(): path for path in paths}
+        self.modules: Dict[str, str] = {}
+        # Single-file modules outside any package, keyed by (directory, name): importable only
+        # from their own directory, as a script's directory is on sys.path, or from the root
+        self.local_modules: Dict[Tuple[str, str], str] = {}
+        self.module_names: Dict[str, str] = {}
+        self.module_roots: Dict[str, str] = {}
+        self.edges: Dict[str, List[str]] = {}
+        self._resolved: Dict[Tuple[str, str], Optional[str]] = {}
+        self.build_module_index()
+
+    def build_module_index(self):
+        """Map dotted module names to files, rooted where the package chain ends"""
+        packages = {posixpath.dirname(path) for path in self.files if posixpath.basename(path) == '__init__.py'}
+        for posix_path, path in sorted(self.files.items()):
+            if not posix_path.endswith('.py'):
+                continue
+            parts = posix_path[:-3].split('/')
+            if parts[-1] == '__init__':
+                parts.pop()
+                if not parts:
+                    continue
+            # Walk up while the containing directory is itself a package
+            start = len(parts) - 1
+            while start > 0 and '/'.join(parts[:start]) in packages:
+                start -= 1
+            module = '.'.join(parts[start:])
+            root = '/'.join(parts[:start])
+            self.module_names[path] = module
+            self.module_roots[path] = root
+            if start == len(parts) - 1 and not posix_path.endswith('__init__.py'):
+                self.local_modules.setdefault((root, module), path)
+            else:
+                self.modules.setdefault(module, path)
+            # Namespace packages without __init__.py: fall back to the full dotted path
+            if len(parts) > 1:
+                self.modules.setdefault('.'.join(parts), path)
+
+    def resolve_python(self, importer: str, spec: str) -> Optional[str]:
+        base = ''
+        name = spec
+        if spec.startswith('.'):
+            level = len(spec) - len(spec.lstrip('.'))
+            package = self.module_names.get(importer, '').split('.')
+            if not importer.endswith('__init__.py'):
+                package = package[:-1]
+            if level > 1:
+                package = package[:len(package) - (level - 1)] if level - 1 <= len(package) else []
+            base = '.'.join(package)
+            name = '.'.join(filter(None, [base, spec[level:]]))
+        
+        root = self.module_roots.get(importer, '')
+        key = (root, base, name)
+        if key not in self._resolved:
+            # "pkg.mod.func" resolves to the longest prefix that names a module
+            target = None
+            parts = name.split('.')
+            for end in range(len(parts), 0, -1):
+                target = self.modules.get('.'.join(parts[:end]))
+                if not target and end == 1:
+                    target = self.local_modules.get((root, parts[0])) or self.local_modules.get(('', parts[0]))
+                if target:
+                    break
+            self._resolved[key] = target
+        return self._resolved[key]
+
+    def resolve_javascript(self, importer: str, spec: str) -> Optional[str]:
+        # Bare specifiers name packages outside the repository
+        if not spec.startswith('.'):
+            return None
+        base = posixpath.dirname(Path(importer).as_posix())
+        key = (base, spec)
+        if key not in self._resolved:
+            target = posixpath.normpath(posixpath.join(base, spec))
+            candidates = [target]
+            candidates.extend(target + ext for ext in self.JS_EXTENSIONS)
+            candidates.extend(f"{target}/index{ext}" for ext in self.JS_EXTENSIONS)
+            self._resolved[key] = next((self.files[c] for c in candidates if c in self.files), None)
+        return self._resolved[key]
+
+    def add(self, path: str, language: str, imports: Sequence[str]):
+        """Resolve one file's imports into outgoing edges"""
+        if language == 'python':
+            resolve = self.resolve_python
+        elif language in ('javascript', 'typescript', 'react'):
+            resolve = self.resolve_javascript
+        else:
+            return
+        targets = set()
+        for spec in imports:
+            target = resolve(path, spec)
+            if target and target != path:
+                targets.add(target)
+        if targets:
+            self.edges[path] = sorted(targets)
+
+    def fan_in(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for targets in self.edges.values():
+            for target in targets:
+                counts[target] = counts.get(target, 0) + 1
+        return counts
+
+    def centrality(self, iterations: int = 20, damping: float = 0.85) -> Dict[str, float]:
+        """PageRank over import edges: O(iterations * (files + edges))"""
+        nodes = list(self.files.values())
+        if not nodes:
+            return {}
+        count = len(nodes)
+        rank = dict.fromkeys(nodes, 1.0 / count)
+        for _ in range(iterations):
+            # Files importing nothing in the repository spread their rank evenly
+            dangling = sum(rank[node] for node in nodes if node not in self.edges)
+            base = (1.0 - damping + damping * dangling) / count
+            updated = dict.fromkeys(nodes, base)
+            for node, targets in self.edges.items():
+                share = damping * rank[node] / len(targets)
+                for target in targets:
+                    updated[target] += share
+            rank = updated
+        return rank
+
+    def most_central(self, limit: int) -> List[str]:
+        """Most central files that something in the repository imports"""
+        fan_in = self.fan_in()
+        rank = self.centrality()
+        ranked = sorted(fan_in, key=lambda path: (-rank[path], -fan_in[path], path))
+        return ranked[:limit]
+
+    def to_dict(self) -> Dict:
+        fan_in = self.fan_in()
+        rank = self.centrality()
+        connected = sorted(set(self.edges) | set(fan_in))
+        return {
+            'files': len(self.files),
+            'edges': sum(len(targets) for targets in self.edges.values()),
+            'adjacency': {path: self.edges[path] for path in sorted(self.edges)},
+            'metrics': {path: {'fan_in': fan_in.get(path, 0),
+                               'fan_out': len(self.edges.get(path, ())),
+                               'centrality': round(rank[path], 6)}
+                        for path in connected}
+        }
+
+class SymbolIndex:
+    """SQLite index over the analysis output for point lookups without rereading the JSON.
+
+    Tables: files, symbols (classes, functions, exports and decorators by
+    name and qualified name), imports, patterns and the resolved dependency
+    edges. Indexes are created after the bulk load, which is much faster than
+    maintaining them row by row.
+    """
+    
+    INDEX_FILE = 'symbol_index.sqlite'
+    SCHEMA_VERSION = 1
+    
+    SCHEMA = """
+        CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT NOT NULL, language TEXT, lines INTEGER,
+                            size INTEGER, complexity_score INTEGER, fast_path INTEGER);
+        CREATE TABLE symbols (file_id INTEGER NOT NULL, kind TEXT NOT NULL, name TEXT NOT NULL,
+                              qualname TEXT NOT NULL, complexity INTEGER);
+        CREATE TABLE imports (file_id INTEGER NOT NULL, module TEXT NOT NULL);
+        CREATE TABLE patterns (file_id INTEGER NOT NULL, kind TEXT NOT NULL, value TEXT NOT NULL);
+        CREATE TABLE dependencies (file_id INTEGER NOT NULL, target_id INTEGER NOT NULL);
+    """
+    INDEXES = """
+        CREATE UNIQUE INDEX files_path ON files (path);
+        CREATE INDEX symbols_name ON symbols (name, kind);
+        CREATE INDEX symbols_qualname ON symbols (qualname);
+        CREATE INDEX imports_module ON imports (module);
+        CREATE INDEX patterns_kind ON patterns (kind, value);
+        CREATE INDEX dependencies_file ON dependencies (file_id);
+        CREATE INDEX dependencies_target ON dependencies (target_id);
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+
+    def build(self, files: Union[List[FileInfo], 'FileInfoStream'], graph: Optional[DependencyGraph] = None,
+              file_imports: Optional[Dict[str, Tuple[str, Sequence[str]]]] = None):
+        """Write a fresh index next to the analysis, replacing any previous one atomically.
+
+        file_imports holds the untruncated (language, imports) per path; files
+        missing from it fall back to FileInfo's first 20 imports.
+        """
+        file_imports = file_imports or {}
+        tmp_path = self.path.with_suffix('.tmp')
+        if tmp_path.exists():
+            tmp_path.unlink()
+        conn = sqlite3.connect(str(tmp_path))
+        try:
+            # A half-written index is simply rebuilt, so durability is not needed
+            conn.execute('PRAGMA journal_mode = OFF')
+            conn.execute('PRAGMA synchronous = OFF')
+            conn.executescript(self.SCHEMA)
+            file_ids: Dict[str, int] = {}
+            symbols, imports, patterns = [], [], []
+            for file_id, file_info in enumerate(files, 1):
+                file_ids[file_info.path] = file_id
+                conn.execute('INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (file_id, file_info.path, file_info.language, file_info.lines, file_info.size,
+                              file_info.complexity_score, int(file_info.fast_path)))
+                for kind, names in (('class', file_info.classes), ('function', file_info.functions),
+                                    ('export', file_info.exports), ('decorator', file_info.decorators)):
+                    for qualname in names:
+                        symbols.append((file_id, kind, qualname.rsplit('.', 1)[-1], qualname,
+                                        file_info.function_complexity.get(qualname) if kind == 'function' else None))
+                full_imports = file_imports.get(file_info.path)
+                imports.extend((file_id, module)
+                               for module in (full_imports[1] if full_imports else file_info.imports))
+                for pattern in file_info.key_patterns:
+                    kind, _, value = pattern.partition(':')
+                    patterns.append((file_id, kind, value.strip()))
+                # Flush in batches so memory stays flat on very large analyses
+                if len(symbols) > 50_000:
+                    self._flush(conn, symbols, imports, patterns)
+            self._flush(conn, symbols, imports, patterns)
+            
+            if graph is not None:
+                conn.executemany('INSERT INTO dependencies VALUES (?, ?)',
+                                 ((file_ids[path], file_ids[target])
+                                  for path, targets in graph.edges.items() if path in file_ids
+                                  for target in targets if target in file_ids))
+            conn.executescript(self.INDEXES)
+            conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _flush(conn: sqlite3.Connection, symbols: List, imports: List, patterns: List):
+        conn.executemany('INSERT INTO symbols VALUES (?, ?, ?, ?, ?)', symbols)
+        conn.executemany('INSERT INTO imports VALUES (?, ?)', imports)
+        conn.executemany('INSERT INTO patterns VALUES (?, ?, ?)', patterns)
+        symbols.clear()
+        imports.clear()
+        patterns.clear()
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        if conn.execute('PRAGMA user_version').fetchone()[0] != self.SCHEMA_VERSION:
+            conn.close()
+            raise RuntimeError(f"{self.path} was built by another version; re-run the analysis with --index")
+        return conn
+
+    def defines(self, name: str, kind: Optional[str] = None) -> List[Tuple]:
+        """Files defining a symbol, matched by short or qualified name"""
+        kinds = (kind,) if kind else ('class', 'function', 'decorator')
+        marks = ', '.join('?' * len(kinds))
+        with contextlib.closing(self.connect()) as conn:
+            return conn.execute(
+                f"""SELECT DISTINCT files.path, symbols.kind, symbols.qualname FROM symbols
+                    JOIN files ON files.id = symbols.file_id
+                    WHERE symbols.name = ? AND symbols.kind IN ({marks})
+                    UNION
+                    SELECT DISTINCT files.path, symbols.kind, symbols.qualname FROM symbols
+                    JOIN files ON files.id = symbols.file_id
+                    WHERE symbols.qualname = ? AND symbols.kind IN ({marks})
+                    ORDER BY 1, 3""", (name, *kinds, name, *kinds)).fetchall()
+
+    def importers(self, module: str) -> List[Tuple]:
+        """Files importing a module or anything inside it"""
+        with contextlib.closing(self.connect()) as conn:
+            # Range scan on the index instead of LIKE, which SQLite cannot index case-sensitively
+            return conn.execute(
+                """SELECT DISTINCT files.path, imports.module FROM imports
+                   JOIN files ON files.id = imports.file_id
+                   WHERE imports.module = ? OR (imports.module >= ? AND imports.module < ?)
+                      OR (imports.module >= ? AND imports.module < ?)
+                   ORDER BY 1, 2""",
+                (module, module + '.', module + '/', module + '/', module + '0')).fetchall()
+
+    def dependents(self, path: str) -> List[Tuple]:
+        """Files in the repository whose imports resolve to the given file"""
+        with contextlib.closing(self.connect()) as conn:
+            return conn.execute(
+                """SELECT source.path FROM files AS target
+                   JOIN dependencies ON dependencies.target_id = target.id
+                   JOIN files AS source ON source.id = dependencies.file_id
+                   WHERE target.path = ? ORDER BY 1""", (path,)).fetchall()
+
+    def dependencies(self, path: str) -> List[Tuple]:
+        """Files in the repository that the given file imports"""
+        with contextlib.closing(self.connect()) as conn:
+            return conn.execute(
+                """SELECT target.path FROM files AS source
+                   JOIN dependencies ON dependencies.file_id = source.id
+                   JOIN files AS target ON target.id = dependencies.target_id
+                   WHERE source.path = ? ORDER BY 1""", (path,)).fetchall()
+
+    def patterns(self, kind: str, value: Optional[str] = None) -> List[Tuple]:
+        """Files with a key pattern of the given kind (e.g. API_ENDPOINT), optionally a given value"""
+        with contextlib.closing(self.connect()) as conn:
+            if value is None:
+                return conn.execute(
+                    """SELECT files.path, patterns.value FROM patterns JOIN files ON files.id = patterns.file_id
+                       WHERE patterns.kind = ? ORDER BY 1, 2""", (kind,)).fetchall()
+            return conn.execute(
+                """SELECT files.path, patterns.value FROM patterns JOIN files ON files.id = patterns.file_id
+                   WHERE patterns.kind = ? AND patterns.value = ? ORDER BY 1""", (kind, value)).fetchall()
+
+class SummaryBuilder:
+    """Assembles markdown from fixed text and scored optional items within a size budget.
+
+    Fixed text is always emitted. Optional items belong to sections and are
+    chosen greedily by score until the budget is spent; a section's heading is
+    charged to the first item chosen from it. Chosen items keep their original
+    order within the section, and the output is produced with a single join.
+    Without a budget every item is emitted.
+    """
+    
+    BYTES_PER_TOKEN = 4  # Rough average for English prose and code identifiers
+    
+    def __init__(self, budget_bytes: Optional[int] = None):
+        self.budget_bytes = budget_bytes
+        self.blocks: List[Union[str, Dict]] = []
+
+    def text(self, text: str):
+        self.blocks.append(text)
+
+    def section(self, heading: str, always: bool = False, separator: str = '') -> Dict:
+        """Open a section at the current position; `always` emits the heading even when empty"""
+        section = {'heading': heading, 'always': always, 'separator': separator, 'items': []}
+        self.blocks.append(section)
+        return section
+
+    def item(self, section: Dict, score: float, text: str):
+        section['items'].append((score, text))
+
+    @staticmethod
+    def size(text: str) -> int:
+        return len(text.encode('utf-8'))
+
+    def select(self) -> Set[Tuple[int, int]]:
+        """(section id, item index) pairs that fit the budget, best scores first"""
+        sections = [block for block in self.blocks if isinstance(block, dict)]
+        candidates = [(score, section_id, index)
+                      for section_id, section in enumerate(sections)
+                      for index, (score, _) in enumerate(section['items'])]
+        if self.budget_bytes is None:
+            return {(section_id, index) for _, section_id, index in candidates}
+        
+        remaining = self.budget_bytes - sum(self.size(block) for block in self.blocks if isinstance(block, str))
+        remaining -= sum(self.size(section['heading']) for section in sections if section['always'])
+        opened = {section_id for section_id, section in enumerate(sections) if section['always']}
+        selected = set()
+        # Stable on ties, so equally scored items are taken in order
+        for score, section_id, index in sorted(candidates, key=lambda c: -c[0]):
+            section = sections[section_id]
+            cost = self.size(section['items'][index][1]) + self.size(section['separator'])
+            if section_id not in opened:
+                cost += self.size(section['heading'])
+            if cost <= remaining:
+                remaining -= cost
+                opened.add(section_id)
+                selected.add((section_id, index))
+        return selected
+
+    def build(self) -> str:
+        selected = self.select()
+        parts = []
+        section_id = 0
+        for block in self.blocks:
+            if isinstance(block, str):
+                parts.append(block)
+                continue
+            chosen = [text for index, (_, text) in enumerate(block['items']) if (section_id, index) in selected]
+            if chosen or block['always']:
+                parts.append(block['heading'])
+                parts.append(block['separator'].join(chosen))
+            section_id += 1
+        return ''.join(parts)
+
+class PythonInfoVisitor(ast.NodeVisitor):
+    """Collects imports, classes, functions, decorators and complexity in one AST traversal.
+
+    Classes and functions are recorded by qualified name (``Outer.method``,
+    ``func.<locals>.inner``). Each function's cyclomatic complexity is one plus
+    its decision points; nested functions and classes are scored on their own.
+    """
+    
+    def __init__(self):
+        self.imports: List[str] = []
+        self.classes: List[str] = []
+        self.functions: List[str] = []
+        self.decorators: List[str] = []
+        self.function_complexity: Dict[str, int] = {}
+        self.module_decisions = 0
+        self._scope: List[str] = []
+        self._decisions: List[int] = []  # Decision counter per open function
+
+    @property
+    def definitions(self) -> int:
+        return len(self.classes) + len(self.function_complexity)
+
+    @property
+    def decisions(self) -> int:
+        """Decision points across the whole module (each function's complexity minus its base 1)"""
+        return sum(self.function_complexity.values()) - len(self.function_complexity) + self.module_decisions
+
+    @staticmethod
+    def decorator_name(node: ast.expr) -> str:
+        if isinstance(node, ast.Call):
+            node = node.func
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if isinstance(node, ast.Name):
+            parts.append(node.id)
+        return '.'.join(reversed(parts))
+
+    def _add_decisions(self, count: int):
+        if self._decisions:
+            self._decisions[-1] += count
+        else:
+            self.module_decisions += count
+
+    def _record_decorators(self, node):
+        for decorator in node.decorator_list:
+            name = self.decorator_name(decorator)
+            if name and name not in self.decorators:
+                self.decorators.append(name)
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self.imports.append(alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        # Relative imports keep their leading dots so they can be resolved later
+        module = '.' * node.level + (node.module or '')
+        for alias in node.names:
+            self.imports.append(f"{module}.{alias.name}" if node.module else f"{module}{alias.name}")
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self._record_decorators(node)
+        self._scope.append(node.name)
+        self.classes.append('.'.join(self._scope))
+        self.generic_visit(node)
+        self._scope.pop()
+
+    def visit_FunctionDef(self, node):
+        self._record_decorators(node)
+        self._scope.append(node.name)
+        qualname = '.'.join(self._scope)
+        self.functions.append(qualname)
+        self._scope.append('<locals>')
+        self._decisions.append(0)
+        self.generic_visit(node)
+        self.function_complexity[qualname] = 1 + self._decisions.pop()
+        self._scope.pop()
+        self._scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_branch(self, node):
+        self._add_decisions(1)
+        self.generic_visit(node)
+
+    visit_If = visit_For = visit_AsyncFor = visit_While = visit_IfExp = visit_branch
+    visit_ExceptHandler = visit_Assert = visit_match_case = visit_branch
+
+    def visit_BoolOp(self, node: ast.BoolOp):
+        self._add_decisions(len(node.values) - 1)
+        self.generic_visit(node)
+
+    def visit_comprehension(self, node: ast.comprehension):
+        self._add_decisions(1 + len(node.ifs))
+        self.generic_visit(node)
+
+@contextlib.contextmanager
+def atomic_open(path: Path):
+    """Write a file under a temporary name and move it into place, so readers never see it half written"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp_path, 'w') as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
 class CodebaseAnalyzer:
     """Main analyzer class for extracting codebase information"""
     
-    def __init__(self, repo_path: str, output_dir: str = "ai_analysis"):
+    def __init__(self, repo_path: str, output_dir: str = "ai_analysis", workers: int = 1,
+                 use_cache: bool = True, stream: bool = False, checkpoint_interval: int = 1000,
+                 resume: bool = False, profile: bool = False, profile_top: int = 10,
+                 max_file_bytes: int = 2_000_000, file_time_budget: float = 5.0,
+                 io_threads: int = 0, prefetch_depth: int = 32, since: Optional[str] = None,
+                 summary_budget: Optional[int] = None, dedup: bool = True):
         self.repo_path = Path(repo_path)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.workers = max(1, workers)
+        self.use_cache = use_cache
+        self.stream = stream
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+        self.profile = profile
+        self.profiler = AnalysisProfiler(profile_top) if profile else None
+        self.dependency_graph: Optional[DependencyGraph] = None
+        # Untruncated imports per file from the last analysis, for the graph and the symbol index
+        self.file_imports: Dict[str, Tuple[str, Sequence[str]]] = {}
+        # Byte-identical files are analysed once and their result reused for each copy
+        self.dedup = dedup
+        self.deduplicated = 0
+        self.duplicate_groups: Optional[List[Dict]] = None
+        # Set by batch mode: a process pool and content cache shared by several analyzers
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.content_cache: Optional[ContentCache] = None
+        # Size limit for ai_summary.md in bytes (None keeps the fixed top-N layout)
+        self.summary_budget = summary_budget
+        # With a budget: longer, uncapped-by-default candidate lists for the summary, in priority order
+        self.summary_candidates: Optional[Dict[str, List]] = None
+        # Git revision for changed-files mode: only files touched since it are re-analyzed
+        self.since = since
+        
+        # Per-file budgets (0 disables); files over them take the sampled fast path
+        self.max_file_bytes = max_file_bytes
+        self.file_time_budget = file_time_budget
+        self.sample_bytes = 64 * 1024
+        self.minified_line_length = 500
+        # Fixed per-file cost (open, stat, setup) in byte-equivalents, for scheduling
+        self.file_overhead_bytes = 4096
+        # Files the pool may hold for re-ordering or in flight at once (per run, not per worker)
+        self.reorder_limit = 4096
+        
+        # Concurrent reads for latency-bound (network) filesystems; 0 reads inline
+        self.io_threads = io_threads
+        self.prefetch_depth = max(1, prefetch_depth)
         
         # File patterns to analyze
         self.code_extensions = {
@@ -92,12 +1458,16 @@ class CodebaseAnalyzer:
             '.sql': 'sql'
         }
         
+        # Per-language extractors beyond the built-in Python and JS/TS ones, loaded on first use
+        self.extractors = ExtractorRegistry()
+        
         # Patterns to ignore
         self.ignore_patterns = {
             'node_modules', '.git', '__pycache__', '.venv', 'venv',
             'dist', 'build', '.next', '.nuxt', 'target', 'bin',
             'obj', '.DS_Store', '*.pyc', '*.class', '*.o'
         }
+        self.ignore_rules = self.load_ignore_rules()
         
         # Framework detection patterns
         self.framework_patterns = {
@@ -113,88 +1483,183 @@ class CodebaseAnalyzer:
             'Nuxt': [r'nuxt.config', r'<nuxt-', r'@nuxtjs'],
             'Svelte': [r'<script>', r'export let', r'svelte/store']
         }
+        
+        # Complexity scoring patterns
+        self.complexity_patterns = [
+            r'class\s+\w+', r'function\s+\w+', r'def\s+\w+',  # Definitions
+            r'if\s*\(', r'for\s*\(', r'while\s*\(',  # Control structures
+            r'try\s*{', r'catch\s*\(', r'except\s*:',  # Error handling
+            r'async\s+', r'await\s+', r'Promise',  # Async patterns
+            r'@\w+', r'#\[.*\]',  # Decorators/attributes
+        ]
+        
+        # API endpoint patterns
+        self.api_patterns = [
+            r'@app\.route\(["\']([^"\']+)["\']',  # Flask
+            r'@PostMapping\(["\']([^"\']+)["\']',  # Spring
+            r'@GetMapping\(["\']([^"\']+)["\']',   # Spring
+            r'router\.get\(["\']([^"\']+)["\']',   # Express
+            r'app\.get\(["\']([^"\']+)["\']',      # Express
+        ]
+        
+        # Database model patterns (case-insensitive)
+        self.db_patterns = [
+            r'class\s+(\w+)\s*\([^)]*Model[^)]*\)',  # Django/SQLAlchemy
+            r'@Entity\s+.*?class\s+(\w+)',           # JPA
+            r'CREATE TABLE\s+(\w+)',                 # SQL
+        ]
+        
+        # React component patterns
+        self.component_patterns = [
+            r'(?:function|const)\s+([A-Z]\w+).*?(?:return\s*\(|\s*=>)',
+            r'class\s+([A-Z]\w+)\s+extends\s+(?:React\.)?Component'
+        ]
+        
+        # JavaScript/TypeScript symbol patterns
+        self.js_import_patterns = [
+            r'import\s+.*?\s+from\s+["\']([^"\']+)["\']',
+            r'import\s+["\']([^"\']+)["\']',
+            r'require\(["\']([^"\']+)["\']\)'
+        ]
+        self.js_export_patterns = [
+            r'export\s+(?:default\s+)?(?:class|function|const|let|var)\s+(\w+)',
+            r'export\s*\{\s*([^}]+)\s*\}',
+            r'module\.exports\s*=\s*(\w+)'
+        ]
+        self.js_function_patterns = [
+            r'function\s+(\w+)\s*\(',
+            r'const\s+(\w+)\s*=\s*(?:async\s+)?\([^)]*\)\s*=>',
+            # Same matches as r'(\w+)\s*:\s*(?:async\s+)?function', but only starts at word
+            # boundaries (or right after a previous match) instead of retrying inside every word
+            (r'(?:(?<!\w)|(?<=function))(\w+)\s*:\s*(?:async\s+)?function', 'function'),
+            r'async\s+function\s+(\w+)'
+        ]
+        
+        # Files discovered alongside the code during the main walk
+        self.entry_point_names = [
+            'main.py', 'app.py', 'index.js', 'server.js', 'main.js',
+            'index.ts', 'main.ts', 'App.js', 'App.tsx', 'index.html'
+        ]
+        self.config_patterns = [
+            'package.json', 'requirements.txt', 'Pipfile', 'pom.xml',
+            'build.gradle', 'Cargo.toml', 'composer.json', 'setup.py',
+            '.env*', 'config.*', 'settings.*', '*.config.*', 'docker*',
+            'webpack.config.*', 'vite.config.*', 'next.config.*'
+        ]
+        self.documentation_pattern = '*.md'
+        self.max_documentation = 10
+        
+        self.patterns = self.build_pattern_engine()
+        # One match per file name tells which config pattern (if any) applies first
+        self.config_matcher = re.compile('|'.join(
+            f'(?P<c{i}>{fnmatch.translate(pattern)})' for i, pattern in enumerate(self.config_patterns)))
+        self.documentation_matcher = re.compile(fnmatch.translate(self.documentation_pattern))
+
+    def build_pattern_engine(self) -> PatternEngine:
+        """Compile every extractor's patterns once"""
+        engine = PatternEngine()
+        engine.add('complexity', self.complexity_patterns)
+        engine.add('api', self.api_patterns)
+        engine.add('db', self.db_patterns, re.IGNORECASE)
+        engine.add('component', self.component_patterns)
+        engine.add('js_import', self.js_import_patterns)
+        engine.add('js_export', self.js_export_patterns)
+        engine.add('js_function', self.js_function_patterns)
+        for framework, patterns in self.framework_patterns.items():
+            engine.add(f'framework:{framework}', patterns, re.IGNORECASE)
+        return engine
+
+    def __getstate__(self):
+        # Workers only need the settings and rules; the pool, shared cache and graph stay here
+        state = self.__dict__.copy()
+        for name in ('executor', 'content_cache', 'dependency_graph', 'summary_candidates'):
+            state[name] = None
+        state['file_imports'] = {}
+        return state
+
+    def load_ignore_rules(self) -> IgnoreRules:
+        """Built-in patterns plus the root .gitignore; nested ones are added as the walk reaches them"""
+        ignore_rules = IgnoreRules(self.ignore_patterns)
+        ignore_rules.add_gitignore(self.repo_path / '.gitignore', '')
+        return ignore_rules
 
     def should_ignore_path(self, path: Path) -> bool:
-        """Check if a path should be ignored"""
-        path_str = str(path)
-        for pattern in self.ignore_patterns:
-            if pattern in path_str or path.name.startswith('.'):
+        """Check if a path, or any directory above it inside the repo, should be ignored"""
+        try:
+            parts = path.relative_to(self.repo_path).parts
+        except ValueError:
+            parts = (path.name,)
+        
+        rel_path = ''
+        for depth, part in enumerate(parts):
+            rel_path = f"{rel_path}/{part}" if rel_path else part
+            if self.ignore_rules.is_ignored(rel_path, part, is_dir=depth < len(parts) - 1):
                 return True
         return False
 
+    def walk_repository(self) -> Iterator[Tuple[str, os.DirEntry]]:
+        """Yield (repo-relative path, entry) for non-ignored files, pruning ignored directories before descending"""
+        stack = [(str(self.repo_path), '')]
+        
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            if rel_dir:
+                gitignore = os.path.join(dir_path, '.gitignore')
+                if os.path.isfile(gitignore):
+                    self.ignore_rules.add_gitignore(Path(gitignore), rel_dir)
+            
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError as e:
+                print(f"Error reading directory {dir_path}: {e}")
+                continue
+            
+            subdirs = []
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if self.ignore_rules.is_ignored(rel_path, entry.name, is_dir):
+                        continue
+                    if is_dir:
+                        subdirs.append((entry.path, rel_path))
+                    elif entry.is_file():
+                        yield rel_path, entry
+                except OSError:
+                    continue
+            
+            # Reversed so the stack visits subdirectories in sorted order
+            stack.extend(reversed(subdirs))
+
     def detect_language(self, file_path: Path) -> str:
         """Detect programming language from file extension"""
         suffix = file_path.suffix.lower()
         return self.code_extensions.get(suffix, 'text')
 
-    def extract_python_info(self, file_path: Path) -> Tuple[List[str], List[str], List[str]]:
-        """Extract imports, classes, and functions from Python files"""
-        imports, classes, functions = [], [], []
-        
+    def extract_python_info(self, file_path: Path, content: str) -> Optional[PythonInfoVisitor]:
+        """Extract imports, classes, functions, decorators and complexity from Python files"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-            tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name)
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.append(f"{node.module}.{node.names[0].name if node.names else ''}")
-                elif isinstance(node, ast.ClassDef):
-                    classes.append(node.name)
-                elif isinstance(node, ast.FunctionDef) or isinstance(node, ast.AsyncFunctionDef):
-                    functions.append(node.name)
-                    
+            visitor = PythonInfoVisitor()
+            visitor.visit(ast.parse(content))
+            return visitor
         except Exception as e:
             print(f"Error parsing Python file {file_path}: {e}")
-            
-        return imports, classes, functions
+            return None
 
-    def extract_javascript_info(self, file_path: Path) -> Tuple[List[str], List[str], List[str]]:
+    def extract_javascript_info(self, file_path: Path, content: str) -> Tuple[List[str], List[str], List[str]]:
         """Extract imports, exports, and functions from JavaScript/TypeScript files"""
         imports, exports, functions = [], [], []
         
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # Import patterns
-            import_patterns = [
-                r'import\s+.*?\s+from\s+["\']([^"\']+)["\']',
-                r'import\s+["\']([^"\']+)["\']',
-                r'require\(["\']([^"\']+)["\']\)'
-            ]
-            
-            for pattern in import_patterns:
-                matches = re.findall(pattern, content)
+            for matches in self.patterns.findall('js_import', content):
                 imports.extend(matches)
             
-            # Export patterns
-            export_patterns = [
-                r'export\s+(?:default\s+)?(?:class|function|const|let|var)\s+(\w+)',
-                r'export\s*\{\s*([^}]+)\s*\}',
-                r'module\.exports\s*=\s*(\w+)'
-            ]
-            
-            for pattern in export_patterns:
-                matches = re.findall(pattern, content)
-                if isinstance(matches, list) and matches:
+            for matches in self.patterns.findall('js_export', content):
+                if matches:
                     exports.extend([match.strip() for match in str(matches[0]).split(',') if match.strip()])
             
-            # Function patterns
-            function_patterns = [
-                r'function\s+(\w+)\s*\(',
-                r'const\s+(\w+)\s*=\s*(?:async\s+)?\([^)]*\)\s*=>',
-                r'(\w+)\s*:\s*(?:async\s+)?function',
-                r'async\s+function\s+(\w+)'
-            ]
-            
-            for pattern in function_patterns:
-                matches = re.findall(pattern, content)
+            for matches in self.patterns.findall('js_function', content):
                 functions.extend(matches)
                 
         except Exception as e:
@@ -202,7 +1667,8 @@ class CodebaseAnalyzer:
             
         return imports, exports, functions
 
-    def calculate_complexity_score(self, file_path: Path, content: str) -> int:
+    def calculate_complexity_score(self, file_path: Path, content: str,
+                                   python_info: Optional[PythonInfoVisitor] = None) -> int:
         """Calculate a simple complexity score for the file"""
         score = 0
         
@@ -210,17 +1676,13 @@ class CodebaseAnalyzer:
         lines = content.count('\n') + 1
         score += min(lines // 10, 50)
         
-        # Add points for complex patterns
-        complex_patterns = [
-            r'class\s+\w+', r'function\s+\w+', r'def\s+\w+',  # Definitions
-            r'if\s*\(', r'for\s*\(', r'while\s*\(',  # Control structures
-            r'try\s*{', r'catch\s*\(', r'except\s*:',  # Error handling
-            r'async\s+', r'await\s+', r'Promise',  # Async patterns
-            r'@\w+', r'#\[.*\]',  # Decorators/attributes
-        ]
-        
-        for pattern in complex_patterns:
-            score += len(re.findall(pattern, content)) * 2
+        # Add points for complex patterns; parsed Python is scored from its AST instead.
+        # Definitions weigh what the regexes give them; decision points, which the regexes
+        # mostly miss in Python, weigh a quarter so scores stay comparable across languages
+        if python_info is not None:
+            score += python_info.definitions * 2 + python_info.decisions // 2
+        else:
+            score += self.patterns.count('complexity', content) * 2
             
         return min(score, 100)  # Cap at 100
 
@@ -228,11 +1690,9 @@ class CodebaseAnalyzer:
         """Detect frameworks used in the content"""
         detected = []
         
-        for framework, patterns in self.framework_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, content, re.IGNORECASE):
-                    detected.append(framework)
-                    break
+        for framework in self.framework_patterns:
+            if self.patterns.search_any(f'framework:{framework}', content):
+                detected.append(framework)
                     
         return detected
 
@@ -240,119 +1700,520 @@ class CodebaseAnalyzer:
         """Extract key patterns that indicate important functionality"""
         patterns = []
         
-        # API endpoint patterns
-        api_patterns = [
-            r'@app\.route\(["\']([^"\']+)["\']',  # Flask
-            r'@PostMapping\(["\']([^"\']+)["\']',  # Spring
-            r'@GetMapping\(["\']([^"\']+)["\']',   # Spring
-            r'router\.get\(["\']([^"\']+)["\']',   # Express
-            r'app\.get\(["\']([^"\']+)["\']',      # Express
-        ]
-        
-        for pattern in api_patterns:
-            matches = re.findall(pattern, content)
+        for matches in self.patterns.findall('api', content):
             patterns.extend([f"API_ENDPOINT: {match}" for match in matches])
         
-        # Database model patterns
-        db_patterns = [
-            r'class\s+(\w+)\s*\([^)]*Model[^)]*\)',  # Django/SQLAlchemy
-            r'@Entity\s+.*?class\s+(\w+)',           # JPA
-            r'CREATE TABLE\s+(\w+)',                 # SQL
-        ]
-        
-        for pattern in db_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
+        for matches in self.patterns.findall('db', content):
             patterns.extend([f"DB_MODEL: {match}" for match in matches])
         
         # React component patterns
         if language in ['javascript', 'typescript', 'react']:
-            component_patterns = [
-                r'(?:function|const)\s+([A-Z]\w+).*?(?:return\s*\(|\s*=>)',
-                r'class\s+([A-Z]\w+)\s+extends\s+(?:React\.)?Component'
-            ]
-            
-            for pattern in component_patterns:
-                matches = re.findall(pattern, content)
+            for matches in self.patterns.findall('component', content):
                 patterns.extend([f"REACT_COMPONENT: {match}" for match in matches])
         
         return patterns
 
+    @staticmethod
+    @contextlib.contextmanager
+    def open_buffer(file_path: Path):
+        """Map a file read-only, falling back to a plain read where mmap is unavailable"""
+        with open(file_path, 'rb') as f:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Empty files and special files cannot be mapped
+                yield f.read()
+                return
+            try:
+                yield buffer
+            finally:
+                buffer.close()
+
+    @staticmethod
+    def count_lines(buffer) -> int:
+        """Count lines over raw bytes as text mode would (\\n, \\r\\n and lone \\r), for valid UTF-8"""
+        newlines = carriage_returns = pairs = 0
+        previous_cr = False
+        for offset in range(0, len(buffer), 1 << 20):
+            chunk = buffer[offset:offset + (1 << 20)]
+            newlines += chunk.count(b'\n')
+            cr_count = chunk.count(b'\r')
+            if cr_count:
+                carriage_returns += cr_count
+                pairs += chunk.count(b'\r\n')
+            if previous_cr and chunk[:1] == b'\n':
+                pairs += 1
+            previous_cr = chunk[-1:] == b'\r'
+        return newlines + carriage_returns - pairs + 1
+
+    @staticmethod
+    def decode_text(buffer) -> str:
+        """Decode bytes straight from the buffer, normalising newlines like text mode"""
+        content = str(buffer, 'utf-8', 'ignore')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
+    def read_file(self, file_path: Path) -> Tuple[str, str]:
+        """Read a file once into a shared text buffer, returning it with its content hash"""
+        with self.open_buffer(file_path) as buffer:
+            return self.decode_text(buffer), hashlib.sha256(buffer).hexdigest()
+
+    def sample_text(self, content: str) -> str:
+        """Head and tail of a text buffer, for pattern probes on oversized content"""
+        if len(content) <= 2 * self.sample_bytes:
+            return content
+        return content[:self.sample_bytes] + '\n' + content[-self.sample_bytes:]
+
+    def budget_settings(self) -> Dict:
+        """Settings that decide which files take the fast path"""
+        return {
+            'max_file_bytes': self.max_file_bytes,
+            'file_time_budget': self.file_time_budget,
+            'sample_bytes': self.sample_bytes,
+            'minified_line_length': self.minified_line_length
+        }
+
+    def cache_settings(self) -> Dict:
+        """Everything besides file content that changes a file's result, compared by the caches"""
+        return dict(self.budget_settings(), extractors=self.extractors.settings())
+
     def analyze_file(self, file_path: Path) -> Optional[FileInfo]:
         """Analyze a single file and extract relevant information"""
-        if self.should_ignore_path(file_path) or not file_path.is_file():
+        return self.analyze_path(file_path).file_info
+
+    def profile_stage(self, name: str):
+        """Context manager timing a repository-level stage when profiling"""
+        return self.profiler.stage(name) if self.profiler else contextlib.nullcontext()
+
+    @staticmethod
+    def _lap(timings: Optional[Dict[str, float]], stage_name: str, started: float) -> float:
+        """Charge the time since `started` to a per-file stage and return the new start"""
+        now = time.perf_counter()
+        if timings is not None:
+            timings[stage_name] = timings.get(stage_name, 0.0) + now - started
+        return now
+
+    def load_file(self, file_path: Path, content_hash: Optional[str] = None) -> Optional[LoadedFile]:
+        """I/O stage: stat, map, hash and decode a file (safe to run on reader threads).
+
+        A content hash already computed by the caller is trusted rather than recomputed.
+        """
+        if self.should_ignore_path(file_path):
             return None
-            
+        
+        timings = {} if self.profile else None
+        mark = time.perf_counter()
+        stat_info = file_path.stat()
+        if not stat.S_ISREG(stat_info.st_mode):
+            return None
+        mark = self._lap(timings, 'stat', mark)
+        
+        with self.open_buffer(file_path) as buffer:
+            # Hash, line count and the size/minified probes all run on the mapped bytes
+            content_hash = content_hash or hashlib.sha256(buffer).hexdigest()
+            lines = self.count_lines(buffer)
+            # Minified bundles: very long average lines are where regexes backtrack. Files small
+            # enough to be decoded whole anyway (one long data line) keep the full analysis
+            sampled = len(buffer) > 2 * self.sample_bytes
+            fast_path = bool((self.max_file_bytes and len(buffer) > self.max_file_bytes)
+                             or (sampled and len(buffer) / lines > self.minified_line_length))
+            if fast_path and sampled:
+                # Only the head and tail are ever decoded for the fast path
+                content = (self.decode_text(buffer[:self.sample_bytes]) + '\n'
+                           + self.decode_text(buffer[-self.sample_bytes:]))
+            else:
+                content = self.decode_text(buffer)
+                # Recount on the text: invalid bytes dropped between \r and \n join them
+                lines = content.count('\n') + 1
+        self._lap(timings, 'read', mark)
+        
+        return LoadedFile(stat_info, content, content_hash, lines, fast_path, timings)
+
+    def analyze_loaded(self, file_path: Path, loaded: LoadedFile) -> FileAnalysisResult:
+        """CPU stage: run every extractor over an already loaded file"""
+        timings = loaded.timings
+        content = loaded.content
+        lines = loaded.lines
+        fast_path = loaded.fast_path
+        language = self.detect_language(file_path)
+        started = mark = time.perf_counter()
+        
+        # Extract language-specific information
+        imports, classes, functions = [], [], []
+        python_info = None
+        
+        if language == 'python' and not fast_path:
+            # A sampled file is not valid Python, so the AST is only built for full reads
+            python_info = self.extract_python_info(file_path, content)
+            if python_info is not None:
+                imports, classes, functions = python_info.imports, python_info.classes, python_info.functions
+        elif language in ['javascript', 'typescript', 'react']:
+            imports, classes, functions = self.extract_javascript_info(file_path, content)
+        else:
+            extractor = self.extractors.get(language)
+            if extractor is not None:
+                try:
+                    imports, classes, functions = extractor.extract(content)
+                except Exception as e:
+                    print(f"Error parsing {language} file {file_path}: {e}")
+        mark = self._lap(timings, 'extract', mark)
+        
+        # Over the time budget: finish on the sample without the complexity regexes
+        if (not fast_path and self.file_time_budget
+                and time.perf_counter() - started > self.file_time_budget):
+            fast_path = True
+            content = self.sample_text(content)
+        
+        # Calculate complexity and extract patterns
+        if fast_path:
+            complexity = min(lines // 10, 50)
+        else:
+            complexity = self.calculate_complexity_score(file_path, content, python_info)
+        mark = self._lap(timings, 'complexity', mark)
+        key_patterns = self.extract_key_patterns(content, language)
+        mark = self._lap(timings, 'key_patterns', mark)
+        frameworks = self.detect_frameworks(content)
+        mark = self._lap(timings, 'frameworks', mark)
+        
+        file_info = FileInfo(
+            path=str(file_path.relative_to(self.repo_path)),
+            size=loaded.stat_info.st_size,
+            lines=lines,
+            file_type=file_path.suffix,
+            language=language,
+            imports=imports[:20],  # Limit to prevent overflow
+            classes=classes[:20],
+            functions=functions[:20],
+            exports=functions[:20],  # Reuse functions for exports
+            decorators=python_info.decorators[:20] if python_info else [],
+            function_complexity={name: python_info.function_complexity[name] for name in functions[:20]}
+                                if python_info else {},
+            key_patterns=key_patterns[:10],
+            complexity_score=complexity,
+            last_modified=datetime.fromtimestamp(loaded.stat_info.st_mtime).isoformat(),
+            fast_path=fast_path
+        )
+        self._lap(timings, 'build', mark)
+        return FileAnalysisResult(file_info, frameworks, loaded.content_hash, timings,
+                                  list(imports) if len(imports) > 20 else None)
+
+    def analyze_path(self, file_path: Path, content_hash: Optional[str] = None) -> FileAnalysisResult:
+        """Analyze a file and detect the frameworks it references from a single read"""
         try:
-            stat_info = file_path.stat()
-            language = self.detect_language(file_path)
-            
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            lines = content.count('\n') + 1
-            
-            # Extract language-specific information
-            imports, classes, functions = [], [], []
+            loaded = self.load_file(file_path, content_hash)
+            if loaded is None:
+                return FileAnalysisResult(None, [])
+            return self.analyze_loaded(file_path, loaded)
+        except Exception as e:
+            print(f"Error analyzing file {file_path}: {e}")
+            return FileAnalysisResult(None, [])
+
+    def analyze_batch(self, file_paths: List[Path],
+                      hashes: Optional[List[Optional[str]]] = None) -> List[FileAnalysisResult]:
+        """Analyze a batch of files in order, prefetching reads when I/O threads are enabled"""
+        hashes = hashes or [None] * len(file_paths)
+        if self.io_threads <= 0 or len(file_paths) < 2:
+            return [self.analyze_path(file_path, content_hash) for file_path, content_hash in zip(file_paths, hashes)]
+        
+        results = []
+        known = dict(zip(file_paths, hashes))
+        reader = PrefetchReader(lambda file_path: self.load_file(file_path, known[file_path]),
+                                self.io_threads, self.prefetch_depth)
+        for file_path, future in reader.read(file_paths):
+            try:
+                loaded = future.result()
+                if loaded is None:
+                    results.append(FileAnalysisResult(None, []))
+                else:
+                    results.append(self.analyze_loaded(file_path, loaded))
+            except Exception as e:
+                print(f"Error analyzing file {file_path}: {e}")
+                results.append(FileAnalysisResult(None, []))
+        return results
+
+    def schedule_batches(self, file_paths: List[Path], sizes: Optional[Dict[Path, int]] = None) -> List[List[int]]:
+        """Group file indexes into pool tasks: outliers largest first, then batches in input order.
+
+        A file's cost is its size plus a fixed per-file overhead, times its
+        extractor's cost weight. Files costing at least one batch's share are
+        outliers and run as tasks of their own, started before anything else
+        (longest processing time first) so none is left running alone at the
+        end. The rest are packed, in input order, into batches of about that
+        cost to keep IPC overhead low.
+        """
+        costs = []
+        for file_path in file_paths:
+            size = sizes.get(file_path, 0) if sizes else 0
+            if self.max_file_bytes and size > self.max_file_bytes:
+                # Only the head and tail of files on the fast path are read
+                size = 2 * self.sample_bytes
+            costs.append((size + self.file_overhead_bytes) * self.extractors.weight(self.detect_language(file_path)))
+        
+        # About eight batches per worker leaves room to even out the tail of the run
+        target = max(1, sum(costs) // (self.workers * 8))
+        outliers: List[Tuple[int, List[int]]] = []
+        batches: List[List[int]] = []
+        batch, batch_cost = [], 0
+        for index, cost in enumerate(costs):
+            if cost >= target:
+                outliers.append((cost, [index]))
+                continue
+            batch.append(index)
+            batch_cost += cost
+            if batch_cost >= target or len(batch) >= 256:
+                batches.append(batch)
+                batch, batch_cost = [], 0
+        if batch:
+            batches.append(batch)
+        
+        outliers.sort(key=lambda task: task[0], reverse=True)
+        return [indexes for _, indexes in outliers] + batches
+
+    def analyze_files(self, file_paths: List[Path], sizes: Optional[Dict[Path, int]] = None,
+                      hashes: Optional[Dict[Path, str]] = None):
+        """Analyze files serially or across a process pool, preserving input order"""
+        hashes = hashes or {}
+        if self.workers == 1 or len(file_paths) < 2:
+            if self.io_threads <= 0:
+                for file_path in file_paths:
+                    yield self.analyze_path(file_path, hashes.get(file_path))
+            else:
+                # Bounded batches keep results flowing to the caller while reads stay in flight
+                batch_size = max(self.prefetch_depth * 4, 256)
+                for start in range(0, len(file_paths), batch_size):
+                    batch = file_paths[start:start + batch_size]
+                    yield from self.analyze_batch(batch, [hashes.get(file_path) for file_path in batch])
+            return
+        
+        # Outliers start first, then batches follow in input order; results are re-ordered
+        # before yielding. Submission stops while the files buffered for re-ordering plus those
+        # in flight reach reorder_limit, so memory (and the lag behind streaming output and
+        # checkpoints) stays bounded however large the repository is, while a slow file only
+        # stalls the pool once that many results have piled up behind it.
+        # Each worker prefetches reads within its own batch when I/O threads are enabled.
+        tasks = self.schedule_batches(file_paths, sizes)
+        limit = max(self.reorder_limit, self.workers * 256)
+        done: Dict[int, FileAnalysisResult] = {}
+        next_index = 0
+        next_task = 0
+        in_flight = 0
+        futures: Dict[Future, List[int]] = {}
+        # Batch mode lends one long-lived pool to every repository's analyzer
+        pool = contextlib.nullcontext(self.executor) if self.executor else ProcessPoolExecutor(max_workers=self.workers)
+        with pool as executor:
+            try:
+                while next_index < len(file_paths):
+                    while next_task < len(tasks) and (not futures
+                                                      or len(done) + in_flight + len(tasks[next_task]) <= limit):
+                        task = tasks[next_task]
+                        futures[executor.submit(self.analyze_batch, [file_paths[index] for index in task],
+                                                [hashes.get(file_paths[index]) for index in task])] = task
+                        in_flight += len(task)
+                        next_task += 1
+                    finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        task = futures.pop(future)
+                        in_flight -= len(task)
+                        done.update(zip(task, future.result()))
+                    while next_index in done:
+                        yield done.pop(next_index)
+                        next_index += 1
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def open_cache(self) -> AnalysisCache:
+        return AnalysisCache(self.output_dir, str(self.repo_path.resolve()), self.cache_settings())
+
+    def copy_result(self, result: FileAnalysisResult, rel_path: str, stat_info: os.stat_result) -> FileAnalysisResult:
+        """Result for a byte-identical copy: the analysed payload with the copy's own path, size and mtime"""
+        if result.file_info is None:
+            return FileAnalysisResult(None, [])
+        # Symbol tuples are shared with the original rather than copied
+        file_info = FileInfo(**dict(result.file_info.to_dict(), path=rel_path, size=stat_info.st_size,
+                                    last_modified=datetime.fromtimestamp(stat_info.st_mtime).isoformat()))
+        return FileAnalysisResult(file_info, result.frameworks, result.content_hash, imports=result.imports,
+                                  copied=True)
+
+    def analyze_cached(self, file_paths: List[Path], retained_paths: Optional[Set[str]] = None,
+                       cache: Optional[AnalysisCache] = None,
+                       sizes: Optional[Dict[Path, int]] = None) -> Iterator[Tuple[Path, FileAnalysisResult]]:
+        """Analyze files in order, reusing cached results for unchanged files when caching is enabled
+        and analysing byte-identical files once when deduplication is enabled"""
+        if not self.use_cache and not self.dedup:
+            # Results first, so the pool generator is run to completion and shut down
+            for result, file_path in zip(self.analyze_files(file_paths, sizes), file_paths):
+                yield file_path, result
+            return
+        
+        # A cache passed in belongs to the caller, who decides when to save it
+        owns_cache = cache is None
+        if self.use_cache:
+            cache = cache or self.open_cache()
+            if retained_paths:
+                cache.retain(retained_paths)
+        else:
+            cache = None
+        results: List[Optional[FileAnalysisResult]] = [None] * len(file_paths)
+        pending = []
+        
+        for index, file_path in enumerate(file_paths):
+            if self.should_ignore_path(file_path):
+                results[index] = FileAnalysisResult(None, [])
+                continue
+            try:
+                stat_info = file_path.stat()
+            except OSError:
+                results[index] = FileAnalysisResult(None, [])
+                continue
             
-            if language == 'python':
-                imports, classes, functions = self.extract_python_info(file_path)
-            elif language in ['javascript', 'typescript', 'react']:
-                imports, classes, functions = self.extract_javascript_info(file_path)
+            rel_path = str(file_path.relative_to(self.repo_path))
+            cached = cache.lookup(rel_path, file_path, stat_info) if cache else None
+            if cached:
+                results[index] = cached
+                cache.hits += 1
+                if self.content_cache is not None:
+                    # Keep the shared entry alive though this repository's own cache answered
+                    self.content_cache.store(file_path, cached)
+            else:
+                pending.append((index, rel_path, stat_info))
+        
+        # Files that need a hash before dispatch are hashed here and workers are handed it. Only
+        # files whose size and suffix match another pending file can be copies; the rest are read
+        # once, by the workers, unless the shared content cache needs their hash
+        to_hash = pending if self.content_cache is not None else []
+        if self.dedup and self.content_cache is None:
+            size_counts: Dict[Tuple[int, str], int] = {}
+            for index, _, stat_info in pending:
+                size_key = (stat_info.st_size, file_paths[index].suffix)
+                size_counts[size_key] = size_counts.get(size_key, 0) + 1
+            to_hash = [(index, rel_path, stat_info) for index, rel_path, stat_info in pending
+                       if size_counts[(stat_info.st_size, file_paths[index].suffix)] > 1]
+        hashes: Dict[int, str] = {}
+        for index, _, _ in to_hash:
+            try:
+                hashes[index] = AnalysisCache.hash_file(file_paths[index])
+            except OSError:
+                pass
+        
+        if self.content_cache is not None:
+            # Files already analysed elsewhere (another repository in the batch) are reused by content
+            still_pending = []
+            for index, rel_path, stat_info in pending:
+                shared = None
+                if index in hashes:
+                    shared = self.content_cache.lookup(hashes[index], file_paths[index], rel_path, stat_info)
+                if shared:
+                    results[index] = shared
+                    if cache:
+                        cache.store(rel_path, stat_info, shared)
+                        cache.hits += 1
+                else:
+                    still_pending.append((index, rel_path, stat_info))
+            pending = still_pending
+        
+        # Byte-identical files (with the same suffix) are analysed once; later copies reuse the result
+        copies: Dict[int, List[Tuple[int, str, os.stat_result]]] = {}
+        if self.dedup:
+            first_copy: Dict[str, int] = {}
+            unique = []
+            for entry in pending:
+                index = entry[0]
+                if index not in hashes:
+                    unique.append(entry)
+                    continue
+                first = first_copy.setdefault(ContentCache.key(hashes[index], file_paths[index]), index)
+                if first == index:
+                    unique.append(entry)
+                else:
+                    copies.setdefault(first, []).append(entry)
+            pending = unique
+            self.deduplicated += sum(len(entries) for entries in copies.values())
+        
+        # Yield results in input order as soon as every earlier file is available
+        next_index = 0
+        pending_paths = [file_paths[index] for index, _, _ in pending]
+        # Sizes from the lookup stat are fresher than the walk's
+        pending_sizes = {file_paths[index]: stat_info.st_size for index, _, stat_info in pending}
+        pending_hashes = {file_paths[index]: hashes[index] for index, _, _ in pending if index in hashes}
+        for (index, rel_path, stat_info), result in zip(pending, self.analyze_files(pending_paths, pending_sizes,
+                                                                                    pending_hashes)):
+            results[index] = result
+            if cache:
+                cache.store(rel_path, stat_info, result)
+                cache.misses += 1
+            if self.content_cache is not None:
+                self.content_cache.store(file_paths[index], result)
+            for copy_index, copy_rel_path, copy_stat in copies.get(index, ()):
+                results[copy_index] = self.copy_result(result, copy_rel_path, copy_stat)
+                if cache:
+                    cache.store(copy_rel_path, copy_stat, results[copy_index])
+            while next_index < len(results) and results[next_index] is not None:
+                result, results[next_index] = results[next_index], None
+                # Released once yielded (copies were filled in when their original arrived),
+                # so streaming runs do not keep every result alive
+                yield file_paths[next_index], result
+                next_index += 1
+        
+        if cache and owns_cache:
+            cache.save()
+        for index in range(next_index, len(results)):
+            result, results[index] = results[index], None
+            yield file_paths[index], result
+
+    def scan_repository(self) -> RepositoryScan:
+        """Walk the tree once, collecting code files, config files, documentation and entry points"""
+        # Fresh rules each walk: .gitignore files may have been edited or removed since the last one
+        self.ignore_rules = self.load_ignore_rules()
+        code_files = []
+        code_sizes = {}
+        code_mtimes = {}
+        config_matches: List[List[str]] = [[] for _ in self.config_patterns]
+        documentation = []
+        root_names = set()
+        
+        for rel_path, entry in self.walk_repository():
+            name = entry.name
+            if os.path.splitext(name)[1].lower() in self.code_extensions:
+                file_path = Path(entry.path)
+                code_files.append(file_path)
+                try:
+                    stat_info = entry.stat()
+                    code_sizes[file_path] = stat_info.st_size
+                    code_mtimes[file_path] = stat_info.st_mtime_ns
+                except OSError:
+                    code_sizes[file_path] = 0
+                    code_mtimes[file_path] = 0
             
-            # Calculate complexity and extract patterns
-            complexity = self.calculate_complexity_score(file_path, content)
-            key_patterns = self.extract_key_patterns(content, language)
+            match = self.config_matcher.match(name)
+            if match:
+                # Grouped by pattern, as the per-pattern searches used to report them
+                config_matches[int(match.lastgroup[1:])].append(rel_path)
             
-            return FileInfo(
-                path=str(file_path.relative_to(self.repo_path)),
-                size=stat_info.st_size,
-                lines=lines,
-                file_type=file_path.suffix,
-                language=language,
-                imports=imports[:20],  # Limit to prevent overflow
-                classes=classes[:20],
-                functions=functions[:20],
-                exports=functions[:20],  # Reuse functions for exports
-                key_patterns=key_patterns[:10],
-                complexity_score=complexity,
-                last_modified=datetime.fromtimestamp(stat_info.st_mtime).isoformat()
-            )
+            if len(documentation) < self.max_documentation and self.documentation_matcher.match(name):
+                documentation.append(rel_path)
             
-        except Exception as e:
-            print(f"Error analyzing file {file_path}: {e}")
-            return None
+            if '/' not in rel_path:
+                root_names.add(name)
+        
+        return RepositoryScan(
+            code_files=code_files,
+            config_files=[rel_path for matches in config_matches for rel_path in matches],
+            documentation=documentation,
+            entry_points=[name for name in self.entry_point_names if name in root_names],
+            code_sizes=code_sizes,
+            code_mtimes=code_mtimes
+        )
 
     def find_entry_points(self) -> List[str]:
         """Find potential entry points for the application"""
-        entry_points = []
-        common_entries = [
-            'main.py', 'app.py', 'index.js', 'server.js', 'main.js',
-            'index.ts', 'main.ts', 'App.js', 'App.tsx', 'index.html'
-        ]
-        
-        for entry in common_entries:
-            entry_path = self.repo_path / entry
-            if entry_path.exists():
-                entry_points.append(entry)
-                
-        return entry_points
+        return self.scan_repository().entry_points
 
     def find_config_files(self) -> List[str]:
         """Find configuration files"""
-        config_files = []
-        config_patterns = [
-            'package.json', 'requirements.txt', 'Pipfile', 'pom.xml',
-            'build.gradle', 'Cargo.toml', 'composer.json', 'setup.py',
-            '.env*', 'config.*', 'settings.*', '*.config.*', 'docker*',
-            'webpack.config.*', 'vite.config.*', 'next.config.*'
-        ]
-        
-        for pattern in config_patterns:
-            for config_file in self.repo_path.rglob(pattern):
-                if not self.should_ignore_path(config_file):
-                    config_files.append(str(config_file.relative_to(self.repo_path)))
-                    
-        return config_files
+        return self.scan_repository().config_files
 
     def extract_dependencies(self) -> Dict[str, str]:
         """Extract project dependencies from various config files"""
@@ -385,9 +2246,10 @@ class CodebaseAnalyzer:
                 
         return dependencies
 
-    def generate_project_overview(self, files: List[FileInfo], structure: ProjectStructure) -> str:
+    def generate_project_overview(self, files: List[FileInfo], structure: ProjectStructure,
+                                  critical_files: Optional[List[FileInfo]] = None) -> str:
         """Generate a comprehensive project overview"""
-        overview = f"""# Project Analysis: {structure.name}
+        parts = [f"""# Project Analysis: {structure.name}
 
 ## Project Statistics
 - **Total Files**: {structure.total_files}
@@ -406,60 +2268,86 @@ class CodebaseAnalyzer:
 {chr(10).join([f"- {dep}" for dep in list(structure.dependencies.keys())[:10]]) if structure.dependencies else 'No dependencies file found'}
 
 ## Critical Files (High Complexity)
-"""
+"""]
         
-        # Add critical files based on complexity
-        critical_files = sorted([f for f in files if f.complexity_score > 30], 
-                              key=lambda x: x.complexity_score, reverse=True)[:10]
+        # Add critical files based on complexity (precomputed by create_resumable_context)
+        if critical_files is None:
+            critical_files = heapq.nlargest(10, (f for f in files if f.complexity_score > 30),
+                                            key=lambda x: x.complexity_score)
         
         for file_info in critical_files:
-            overview += f"- **{file_info.path}** ({file_info.language}, {file_info.lines} lines, complexity: {file_info.complexity_score})\n"
+            parts.append(f"- **{file_info.path}** ({file_info.language}, {file_info.lines} lines, complexity: {file_info.complexity_score})\n")
             if file_info.key_patterns:
-                overview += f"  - Key patterns: {', '.join(file_info.key_patterns[:3])}\n"
+                parts.append(f"  - Key patterns: {', '.join(file_info.key_patterns[:3])}\n")
         
-        return overview
+        return ''.join(parts)
 
-    def create_resumable_context(self, files: List[FileInfo], structure: ProjectStructure) -> ResumableContext:
+    def create_resumable_context(self, files: List[FileInfo], structure: ProjectStructure,
+                                 graph: Optional[DependencyGraph] = None) -> ResumableContext:
         """Create resumable context for AI understanding"""
         
-        # Extract API endpoints
-        api_endpoints = []
-        for file_info in files:
+        api_endpoints, db_models, ui_components = [], [], []
+        critical_paths = []
+        path_markers = {'models': False, 'controller': False, 'service': False, 'component': False}
+        
+        # A summary budget may have room for more than the context's fixed counts; collect up to
+        # as many items as could fit (each takes well over 32 bytes). The context keeps prefixes
+        extra = self.summary_budget // 32 if self.summary_budget is not None else 0
+        max_endpoints, max_models, max_ui, max_complex = (max(count, extra) for count in (20, 15, 20, 15))
+        
+        # Bounded min-heap of the most complex files; the negated index keeps
+        # ties in file order, matching a stable descending sort
+        top_complex: List[Tuple[int, int, FileInfo]] = []
+        
+        # Single pass over the files fills every category
+        for index, file_info in enumerate(files):
             for pattern in file_info.key_patterns:
                 if pattern.startswith("API_ENDPOINT:"):
-                    api_endpoints.append({
-                        'endpoint': pattern.replace("API_ENDPOINT: ", ""),
-                        'file': file_info.path,
-                        'language': file_info.language
-                    })
-        
-        # Extract database models
-        db_models = []
-        for file_info in files:
-            for pattern in file_info.key_patterns:
-                if pattern.startswith("DB_MODEL:"):
-                    db_models.append({
-                        'model': pattern.replace("DB_MODEL: ", ""),
-                        'file': file_info.path,
-                        'language': file_info.language
-                    })
-        
-        # Extract UI components
-        ui_components = []
-        for file_info in files:
-            for pattern in file_info.key_patterns:
-                if pattern.startswith("REACT_COMPONENT:"):
-                    ui_components.append({
-                        'component': pattern.replace("REACT_COMPONENT: ", ""),
-                        'file': file_info.path,
-                        'language': file_info.language
-                    })
-        
-        # Identify key components
-        key_components = []
-        critical_files = sorted([f for f in files if f.complexity_score > 25], 
-                              key=lambda x: x.complexity_score, reverse=True)[:15]
+                    if len(api_endpoints) < max_endpoints:
+                        api_endpoints.append({
+                            'endpoint': pattern.replace("API_ENDPOINT: ", ""),
+                            'file': file_info.path,
+                            'language': file_info.language
+                        })
+                elif pattern.startswith("DB_MODEL:"):
+                    if len(db_models) < max_models:
+                        db_models.append({
+                            'model': pattern.replace("DB_MODEL: ", ""),
+                            'file': file_info.path,
+                            'language': file_info.language
+                        })
+                elif pattern.startswith("REACT_COMPONENT:"):
+                    if len(ui_components) < max_ui:
+                        ui_components.append({
+                            'component': pattern.replace("REACT_COMPONENT: ", ""),
+                            'file': file_info.path,
+                            'language': file_info.language
+                        })
+            
+            complexity = file_info.complexity_score
+            if complexity > 25:
+                entry = (complexity, -index, file_info)
+                if len(top_complex) < max_complex:
+                    heapq.heappush(top_complex, entry)
+                elif entry > top_complex[0]:
+                    heapq.heapreplace(top_complex, entry)
+            if complexity > 40 and len(critical_paths) < 10:
+                critical_paths.append(file_info.path)
+            
+            lower_path = file_info.path.lower()
+            for marker, seen in path_markers.items():
+                if not seen and marker in lower_path:
+                    path_markers[marker] = True
         
+        critical_files = [entry[2] for entry in sorted(top_complex, key=lambda e: e[:2], reverse=True)]
+        
+        # The most imported-upon files lead; highly complex files fill the remaining slots
+        if graph is not None and graph.edges:
+            central = graph.most_central(10)
+            critical_paths = (central + [path for path in critical_paths if path not in central])[:10]
+        
+        # Identify key components (the context keeps the top 15)
+        key_components = []
         for file_info in critical_files:
             component = {
                 'name': Path(file_info.path).stem,
@@ -475,31 +2363,44 @@ class CodebaseAnalyzer:
         
         # Detect architecture patterns
         patterns = []
-        if any('models' in f.path.lower() for f in files):
+        if path_markers['models']:
             patterns.append("Model-View Architecture")
-        if any('controller' in f.path.lower() for f in files):
+        if path_markers['controller']:
             patterns.append("MVC Pattern")
-        if any('service' in f.path.lower() for f in files):
+        if path_markers['service']:
             patterns.append("Service Layer Pattern")
-        if any('component' in f.path.lower() for f in files):
+        if path_markers['component']:
             patterns.append("Component-Based Architecture")
         
+        # Every file above 30 ranks ahead of the 26-30 band, so the overview's
+        # top 10 is a prefix of the top 15
+        overview_files = [f for f in critical_files if f.complexity_score > 30][:10]
+        
+        if self.summary_budget is not None:
+            self.summary_candidates = {
+                'key_components': key_components,
+                'api_endpoints': api_endpoints,
+                'database_models': db_models,
+                'ui_components': ui_components,
+                'dependencies': list(structure.dependencies)
+            }
+        
         return ResumableContext(
-            project_overview=self.generate_project_overview(files, structure),
+            project_overview=self.generate_project_overview(files, structure, overview_files),
             technical_stack={
                 'languages': structure.languages,
                 'frameworks': structure.frameworks,
                 'dependencies': dict(list(structure.dependencies.items())[:20])
             },
             architecture_patterns=patterns,
-            key_components=key_components,
+            key_components=key_components[:15],
             api_endpoints=api_endpoints[:20],
             database_models=db_models[:15],
             ui_components=ui_components[:20],
             external_services=[dep for dep in structure.dependencies.keys() 
                              if any(service in dep.lower() for service in 
                                    ['api', 'http', 'request', 'axios', 'fetch'])],
-            critical_files=[f.path for f in files if f.complexity_score > 40][:10],
+            critical_files=critical_paths,
             analysis_timestamp=datetime.now().isoformat(),
             progress_markers={
                 'structure_analyzed': True,
@@ -509,34 +2410,254 @@ class CodebaseAnalyzer:
             }
         )
 
-    def analyze_repository(self) -> Tuple[List[FileInfo], ProjectStructure, ResumableContext]:
+    def analyze_repository(self) -> Tuple[Union[List[FileInfo], FileInfoStream], ProjectStructure, ResumableContext]:
         """Analyze the entire repository"""
         print(f"Analyzing repository at: {self.repo_path}")
         
-        files = []
+        # In streaming mode records go straight to disk and are re-read lazily afterwards
+        files = FileInfoStream(self.output_dir / 'files_analysis.ndjson') if self.stream else []
         languages = {}
         total_lines = 0
         all_frameworks = set()
         
-        # Analyze all code files
-        for file_path in self.repo_path.rglob('*'):
-            if file_path.suffix.lower() in self.code_extensions:
-                file_info = self.analyze_file(file_path)
+        # Collect candidate code files up front so workers get a stable order
+        with self.profile_stage('walk'):
+            scan = self.scan_repository()
+        file_paths = scan.code_files
+        
+        if self.since and not self.use_cache:
+            # Unchanged files' frameworks, full imports and hashes only live in the cache
+            print("--since needs the analysis cache; running a full analysis")
+        elif self.since:
+            previous = self.load_previous_files()
+            if previous is not None:
+                return self.analyze_changed(scan, previous)
+            print(f"No usable previous analysis in {self.output_dir}; running a full analysis")
+        
+        checkpoint = None
+        processed_paths = set()
+        restored_imports: Dict[str, List[str]] = {}
+        restored_hashes: Dict[str, str] = {}
+        if self.checkpoint_interval > 0:
+            checkpoint = AnalysisCheckpoint(self.output_dir, str(self.repo_path.resolve()),
+                                            self.checkpoint_interval, files if self.stream else None)
+            state = checkpoint.load() if self.resume else None
+            checkpoint.start(state)
+            if state:
+                languages = state['languages']
+                total_lines = state['total_lines']
+                all_frameworks.update(state['frameworks'])
+                if not self.stream:
+                    files = checkpoint.restored_files()
+                processed_paths = state['processed']
+                restored_imports = state['imports']
+                restored_hashes = state['hashes']
+                file_paths = [p for p in file_paths
+                              if str(p.relative_to(self.repo_path)) not in processed_paths]
+                print(f"Resuming from checkpoint: {len(state['processed'])} files already processed, "
+                      f"{len(file_paths)} remaining")
+        elif self.stream:
+            files.open()
+        
+        # Imports per analysed file, kept untruncated for the dependency graph
+        file_imports: Dict[str, Tuple[str, Sequence[str]]] = {}
+        # (content hash, size) per file, for the duplicate report
+        content_hashes: Dict[str, Tuple[str, int]] = {}
+        
+        start_time = time.perf_counter()
+        try:
+            for file_path, result in self.analyze_cached(file_paths, processed_paths, sizes=scan.code_sizes):
+                file_info = result.file_info
+                if self.profiler:
+                    self.profiler.record_file(result)
                 if file_info:
                     files.append(file_info)
+                    file_imports[file_info.path] = (file_info.language,
+                                                    result.imports if result.imports is not None else file_info.imports)
+                    if result.content_hash:
+                        content_hashes[file_info.path] = (result.content_hash, file_info.size)
                     
                     # Update statistics
                     languages[file_info.language] = languages.get(file_info.language, 0) + 1
                     total_lines += file_info.lines
-                    
-                    # Detect frameworks from file content
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                            frameworks = self.detect_frameworks(content)
-                            all_frameworks.update(frameworks)
-                    except Exception:
-                        pass
+                    all_frameworks.update(result.frameworks)
+                
+                if checkpoint:
+                    checkpoint.record(str(file_path.relative_to(self.repo_path)), file_info, result.imports,
+                                      result.content_hash)
+                    if checkpoint.due():
+                        checkpoint.save(languages, total_lines, all_frameworks)
+        except BaseException:
+            if checkpoint:
+                # Everything yielded so far is consistent, so keep it for --resume
+                checkpoint.save(languages, total_lines, all_frameworks)
+                print(f"Analysis interrupted; resume with --resume ({checkpoint.paths_count} files checkpointed)")
+            raise
+        finally:
+            if checkpoint:
+                checkpoint.close()
+            if self.stream:
+                files.close()
+        
+        if checkpoint:
+            checkpoint.clear()
+        
+        elapsed = time.perf_counter() - start_time
+        if self.profiler:
+            self.profiler.stages['analyze'] = elapsed
+        rate = len(file_paths) / elapsed if elapsed > 0 else 0.0
+        print(f"Analyzed {len(file_paths)} files in {elapsed:.2f}s "
+              f"({rate:.1f} files/sec, {self.workers} worker{'s' if self.workers > 1 else ''})")
+        if self.deduplicated:
+            print(f"Reused results for {self.deduplicated} byte-identical copies")
+        
+        if processed_paths:
+            # Files from before the checkpoint: FileInfo's imports unless the checkpoint kept the full list
+            for file_info in files:
+                if file_info.path not in file_imports:
+                    file_imports[file_info.path] = (file_info.language,
+                                                    restored_imports.get(file_info.path, file_info.imports))
+                    if file_info.path in restored_hashes:
+                        content_hashes[file_info.path] = (restored_hashes[file_info.path], file_info.size)
+        
+        return self.finish_analysis(files, scan, languages, total_lines, all_frameworks, file_imports,
+                                    content_hashes)
+
+    @staticmethod
+    def find_duplicate_groups(content_hashes: Dict[str, Tuple[str, int]]) -> List[Dict]:
+        """Groups of byte-identical files, the most wasted bytes first"""
+        by_hash: Dict[str, List[str]] = {}
+        sizes: Dict[str, int] = {}
+        for path, (content_hash, size) in content_hashes.items():
+            by_hash.setdefault(content_hash, []).append(path)
+            sizes[content_hash] = size
+        groups = [{'content_hash': content_hash, 'size': sizes[content_hash], 'copies': len(paths),
+                   'paths': sorted(paths)}
+                  for content_hash, paths in by_hash.items() if len(paths) > 1]
+        groups.sort(key=lambda g: (-g['size'] * (g['copies'] - 1), g['paths'][0]))
+        return groups
+
+    def git_changed_paths(self, since: str) -> Set[str]:
+        """Paths under the repository changed since a revision, plus untracked files, from local git"""
+        commands = [
+            ['git', '-C', str(self.repo_path), 'diff', '--name-only', '--no-renames', '--relative', '-z', since, '--'],
+            ['git', '-C', str(self.repo_path), 'ls-files', '--others', '--exclude-standard', '-z']
+        ]
+        changed = set()
+        for command in commands:
+            result = subprocess.run(command, capture_output=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"'{' '.join(command[3:5])}' failed: "
+                                   f"{result.stderr.decode('utf-8', 'replace').strip()}")
+            changed.update(str(Path(name)) for name in result.stdout.decode('utf-8').split('\0') if name)
+        return changed
+
+    def load_previous_files(self) -> Optional[List[FileInfo]]:
+        """FileInfo records from the last analysis in the output directory, if there is a usable one"""
+        path = self.output_dir / ('files_analysis.ndjson' if self.stream else 'files_analysis.json')
+        if not path.exists():
+            return None
+        try:
+            if self.stream:
+                return list(FileInfoStream(path))
+            with open(path, 'r') as f:
+                return [FileInfo(**record) for record in json.load(f)]
+        except (OSError, ValueError, TypeError) as e:
+            # e.g. written by a version with other FileInfo fields
+            print(f"Ignoring previous analysis {path}: {e}")
+            return None
+
+    def analyze_changed(self, scan: RepositoryScan, previous: List[FileInfo]
+                        ) -> Tuple[Union[List[FileInfo], FileInfoStream], ProjectStructure, ResumableContext]:
+        """Re-analyze files changed since self.since and merge them into the previous analysis"""
+        with self.profile_stage('git'):
+            changed = self.git_changed_paths(self.since)
+        
+        previous_files = {file_info.path: file_info for file_info in previous}
+        rel_paths = [str(file_path.relative_to(self.repo_path)) for file_path in scan.code_files]
+        cache = self.open_cache()
+        # Changed files, plus any the previous analysis or the cache lacks (the cache entry supplies
+        # an unchanged file's frameworks, full imports and hash); deleted files drop out with the walk
+        stale = {rel_path for rel_path in rel_paths
+                 if rel_path in changed or rel_path not in previous_files or rel_path not in cache.entries}
+        stale_paths = [file_path for file_path, rel_path in zip(scan.code_files, rel_paths) if rel_path in stale]
+        print(f"{len(changed)} paths changed since {self.since}; re-analyzing {len(stale_paths)} files")
+        
+        fresh: Dict[str, FileAnalysisResult] = {}
+        start_time = time.perf_counter()
+        for file_path, result in self.analyze_cached(stale_paths, set(rel_paths) - stale, cache, scan.code_sizes):
+            if self.profiler:
+                self.profiler.record_file(result)
+            fresh[str(file_path.relative_to(self.repo_path))] = result
+        cache.save()
+        elapsed = time.perf_counter() - start_time
+        if self.profiler:
+            self.profiler.stages['analyze'] = elapsed
+        print(f"Analyzed {len(stale_paths)} files in {elapsed:.2f}s")
+        
+        all_frameworks = set()
+        files = FileInfoStream(self.output_dir / 'files_analysis.ndjson') if self.stream else []
+        languages = {}
+        total_lines = 0
+        file_imports: Dict[str, Tuple[str, Sequence[str]]] = {}
+        content_hashes: Dict[str, Tuple[str, int]] = {}
+        with self.profile_stage('merge'):
+            if self.stream:
+                files.open()
+            for rel_path in rel_paths:
+                if rel_path in stale:
+                    result = fresh.get(rel_path)
+                    file_info = result.file_info if result else None
+                    if file_info is None:
+                        continue
+                    imports = result.imports
+                    content_hash = result.content_hash
+                    all_frameworks.update(result.frameworks)
+                else:
+                    file_info = previous_files[rel_path]
+                    # The cache keeps the frameworks, untruncated imports and content hashes of
+                    # unchanged files, so the merged set drops frameworks only deleted files used
+                    entry = cache.entries[rel_path]
+                    imports = entry.get('imports')
+                    content_hash = entry['content_hash']
+                    all_frameworks.update(entry['frameworks'])
+                
+                files.append(file_info)
+                languages[file_info.language] = languages.get(file_info.language, 0) + 1
+                total_lines += file_info.lines
+                file_imports[file_info.path] = (file_info.language,
+                                                imports if imports is not None else file_info.imports)
+                if content_hash:
+                    content_hashes[file_info.path] = (content_hash, file_info.size)
+            if self.stream:
+                files.close()
+        
+        return self.finish_analysis(files, scan, languages, total_lines, all_frameworks, file_imports,
+                                    content_hashes)
+
+    def finish_analysis(self, files: Union[List[FileInfo], FileInfoStream], scan: RepositoryScan,
+                        languages: Dict[str, int], total_lines: int, all_frameworks: Set[str],
+                        file_imports: Dict[str, Tuple[str, Sequence[str]]],
+                        content_hashes: Optional[Dict[str, Tuple[str, int]]] = None
+                        ) -> Tuple[Union[List[FileInfo], FileInfoStream], ProjectStructure, ResumableContext]:
+        """Build the dependency graph, project structure and context from the per-file results"""
+        with self.profile_stage('dependencies'):
+            dependencies = self.extract_dependencies()
+        
+        # Groups built from some files' hashes would under-report, so without all of them there is no report
+        self.duplicate_groups = None
+        if content_hashes is not None and len(content_hashes) == len(file_imports):
+            with self.profile_stage('duplicates'):
+                self.duplicate_groups = self.find_duplicate_groups(content_hashes)
+        elif content_hashes is not None:
+            print(f"Content hashes missing for {len(file_imports) - len(content_hashes)} files; "
+                  f"skipping the duplicate report")
+        
+        self.file_imports = file_imports
+        with self.profile_stage('graph'):
+            self.dependency_graph = DependencyGraph(list(file_imports))
+            for path, (language, imports) in file_imports.items():
+                self.dependency_graph.add(path, language, imports)
         
         # Create project structure
         structure = ProjectStructure(
@@ -545,83 +2666,160 @@ class CodebaseAnalyzer:
             total_files=len(files),
             total_lines=total_lines,
             languages=languages,
-            frameworks=list(all_frameworks),
-            dependencies=self.extract_dependencies(),
-            entry_points=self.find_entry_points(),
-            config_files=self.find_config_files(),
-            documentation=[str(p.relative_to(self.repo_path)) for p in self.repo_path.rglob('*.md')][:10]
+            frameworks=sorted(all_frameworks),
+            dependencies=dependencies,
+            entry_points=scan.entry_points,
+            config_files=scan.config_files,
+            documentation=scan.documentation
         )
         
         # Create resumable context
-        context = self.create_resumable_context(files, structure)
+        with self.profile_stage('context'):
+            context = self.create_resumable_context(files, structure, self.dependency_graph)
         
         return files, structure, context
 
-    def save_analysis(self, files: List[FileInfo], structure: ProjectStructure, context: ResumableContext):
-        """Save analysis results to files"""
+    def save_analysis(self, files: Union[List[FileInfo], FileInfoStream], structure: ProjectStructure,
+                      context: ResumableContext, announce: bool = True):
+        """Save analysis results to files, each replaced atomically"""
         
-        # Save detailed file analysis
-        with open(self.output_dir / 'files_analysis.json', 'w') as f:
-            json.dump([asdict(file_info) for file_info in files], f, indent=2)
+        # Save detailed file analysis (already written incrementally when streaming)
+        if isinstance(files, FileInfoStream):
+            print(f"File analysis streamed to: {files.path}")
+        else:
+            with self.profile_stage('save:files_analysis'), atomic_open(self.output_dir / 'files_analysis.json') as f:
+                self.write_files_json(files, f)
         
         # Save project structure
-        with open(self.output_dir / 'project_structure.json', 'w') as f:
+        with self.profile_stage('save:project_structure'), atomic_open(self.output_dir / 'project_structure.json') as f:
             json.dump(asdict(structure), f, indent=2)
         
+        # Save the import graph with fan-in/fan-out and centrality per file
+        if self.dependency_graph is not None:
+            with self.profile_stage('save:dependency_graph'), atomic_open(self.output_dir / 'dependency_graph.json') as f:
+                json.dump(self.dependency_graph.to_dict(), f, indent=2)
+        
+        # Save groups of byte-identical files (a report from an earlier run would be stale)
+        if self.duplicate_groups is None:
+            (self.output_dir / 'duplicate_files.json').unlink(missing_ok=True)
+        else:
+            with self.profile_stage('save:duplicate_files'), atomic_open(self.output_dir / 'duplicate_files.json') as f:
+                json.dump({
+                    'groups': len(self.duplicate_groups),
+                    'duplicate_files': sum(g['copies'] - 1 for g in self.duplicate_groups),
+                    'duplicate_bytes': sum(g['size'] * (g['copies'] - 1) for g in self.duplicate_groups),
+                    'duplicates': self.duplicate_groups
+                }, f, indent=2)
+        
         # Save resumable context (main output for AI)
-        with open(self.output_dir / 'ai_context.json', 'w') as f:
+        with self.profile_stage('save:ai_context'), atomic_open(self.output_dir / 'ai_context.json') as f:
             json.dump(asdict(context), f, indent=2)
         
         # Save AI-friendly summary
-        with open(self.output_dir / 'ai_summary.md', 'w') as f:
+        with self.profile_stage('save:ai_summary'), atomic_open(self.output_dir / 'ai_summary.md') as f:
             f.write(self.generate_ai_summary(context))
         
+        if not announce:
+            return
         print(f"Analysis saved to {self.output_dir}/")
         print(f"Main AI context file: {self.output_dir}/ai_context.json")
         print(f"Human-readable summary: {self.output_dir}/ai_summary.md")
 
+    def save_symbol_index(self, files: Union[List[FileInfo], FileInfoStream]):
+        """Write symbol_index.sqlite for the query subcommand"""
+        index = SymbolIndex(self.output_dir / SymbolIndex.INDEX_FILE)
+        with self.profile_stage('save:symbol_index'):
+            index.build(files, self.dependency_graph, self.file_imports)
+        print(f"Symbol index: {index.path}")
+
+    def save_timing_report(self):
+        """Print the profile and write it next to ai_context.json"""
+        if not self.profiler:
+            return
+        self.profiler.print_summary()
+        report_path = self.output_dir / AnalysisProfiler.REPORT_FILE
+        with open(report_path, 'w') as f:
+            json.dump(self.profiler.report(), f, indent=2)
+        print(f"Timing report: {report_path}")
+
+    def write_files_json(self, files: List[FileInfo], f):
+        """Stream an indented JSON array of FileInfo records without building intermediate dicts"""
+        if not files:
+            f.write('[]')
+            return
+        f.write('[\n')
+        for index, file_info in enumerate(files):
+            if index:
+                f.write(',\n')
+            f.write('  ')
+            f.write(file_info.to_json(indent=2, level=1))
+        f.write('\n]')
+
     def generate_ai_summary(self, context: ResumableContext) -> str:
-        """Generate AI-friendly summary for immediate use"""
-        summary = f"""# AI Codebase Context
+        """Generate AI-friendly summary for immediate use.
 
-{context.project_overview}
+        With a summary budget, every discovered item competes for the space by
+        importance instead of the fixed top-N slices, drawing on the longer
+        candidate lists kept when this analyzer built the context.
+        """
+        budgeted = self.summary_budget is not None
+        candidates = self.summary_candidates if budgeted and self.summary_candidates else {
+            'key_components': context.key_components,
+            'api_endpoints': context.api_endpoints,
+            'database_models': context.database_models,
+            'ui_components': context.ui_components,
+            'dependencies': list(context.technical_stack['dependencies'])
+        }
+        
+        def top(items: List, count: int) -> List:
+            return items if budgeted else items[:count]
+        
+        def ranked(section: Dict, texts: List[str], weight: float, decay: float):
+            # Context lists are already in priority order, so rank stands in for importance
+            for rank, text in enumerate(texts):
+                builder.item(section, weight - rank * decay, text)
+        
+        builder = SummaryBuilder(self.summary_budget)
+        builder.text("# AI Codebase Context\n\n")
+        builder.item(builder.section('', always=not budgeted), 1000, context.project_overview)
+        builder.text(f"""
 
 ## Technical Stack Summary
 **Languages**: {', '.join([f"{k} ({v} files)" for k, v in context.technical_stack['languages'].items()])}
 **Frameworks**: {', '.join(context.technical_stack['frameworks'])}
 **Architecture Patterns**: {', '.join(context.architecture_patterns)}
-
+""")
+        
+        components = builder.section("""
 ## Critical Components for AI Understanding
 
 ### Top Priority Files (High Complexity)
-"""
-        
-        for component in context.key_components[:5]:
-            summary += f"**{component['name']}** (`{component['path']}`)\n"
-            summary += f"- Type: {component['type']}, Complexity: {component['complexity']}, Lines: {component['lines']}\n"
-            summary += f"- Key functions: {', '.join(component['functions'][:5])}\n"
+""", always=not budgeted)
+        component_texts = []
+        for component in top(candidates['key_components'], 5):
+            lines = [f"**{component['name']}** (`{component['path']}`)\n",
+                     f"- Type: {component['type']}, Complexity: {component['complexity']}, Lines: {component['lines']}\n",
+                     f"- Key functions: {', '.join(component['functions'][:5])}\n"]
             if component['classes']:
-                summary += f"- Key classes: {', '.join(component['classes'][:3])}\n"
-            summary += "\n"
-
-        if context.api_endpoints:
-            summary += "\n### API Endpoints Discovered\n"
-            for endpoint in context.api_endpoints[:10]:
-                summary += f"- `{endpoint['endpoint']}` (in {endpoint['file']})\n"
-
-        if context.database_models:
-            summary += "\n### Database Models\n"
-            for model in context.database_models[:8]:
-                summary += f"- `{model['model']}` (in {model['file']})\n"
-
-        if context.ui_components:
-            summary += "\n### UI Components\n"
-            for component in context.ui_components[:10]:
-                summary += f"- `{component['component']}` (in {component['file']})\n"
-
-        summary += f"""
-## External Dependencies & Services
-{chr(10).join([f"- {dep}" for dep in list(context.technical_stack['dependencies'].keys())[:15]])}
+                lines.append(f"- Key classes: {', '.join(component['classes'][:3])}\n")
+            lines.append("\n")
+            component_texts.append(''.join(lines))
+        ranked(components, component_texts, 500, 10)
+        
+        ranked(builder.section("\n### API Endpoints Discovered\n"),
+               [f"- `{endpoint['endpoint']}` (in {endpoint['file']})\n" for endpoint in top(candidates['api_endpoints'], 10)],
+               300, 5)
+        ranked(builder.section("\n### Database Models\n"),
+               [f"- `{model['model']}` (in {model['file']})\n" for model in top(candidates['database_models'], 8)],
+               280, 5)
+        ranked(builder.section("\n### UI Components\n"),
+               [f"- `{component['component']}` (in {component['file']})\n" for component in top(candidates['ui_components'], 10)],
+               200, 5)
+        ranked(builder.section("\n## External Dependencies & Services\n", always=True, separator="\n"),
+               [f"- {dep}" for dep in top(candidates['dependencies'], 15)],
+               100, 1)
+        
+        builder.text(f"""
 
 ## For AI Development Tasks:
 1. **Start with these critical files**: {', '.join(context.critical_files[:5])}
@@ -632,43 +2830,440 @@ class CodebaseAnalyzer:
 ---
 *Analysis completed: {context.analysis_timestamp}*
 *This context is designed to be resumable - save this file to maintain context across AI conversations.*
-"""
+""")
+        
+        return builder.build()
+
+
+class RepositoryWatcher:
+    """In-memory model of a repository, brought up to date by re-analysing only changed files.
+
+    Changes are found by polling: each pass walks the tree and compares the
+    (mtime, size) of every code and config file with the previous pass.
+    Per-file results are kept between updates, so the project structure and
+    context are rebuilt without touching unchanged files. The analysis cache
+    also stays in memory and is written every CACHE_SAVE_INTERVAL seconds
+    and at shutdown, not after each update.
+    """
+    
+    CACHE_SAVE_INTERVAL = 300
+    
+    def __init__(self, analyzer: CodebaseAnalyzer):
+        self.analyzer = analyzer
+        self.results: Dict[str, FileAnalysisResult] = {}
+        self.stamps: Dict[str, Tuple[int, int]] = {}
+        self.cache = analyzer.open_cache() if analyzer.use_cache else None
+        self.cache_saved = time.perf_counter()
+
+    def poll(self) -> Tuple[RepositoryScan, Dict[str, Tuple[int, int]]]:
+        """Walk the tree and stamp every file whose edits should trigger an update"""
+        scan = self.analyzer.scan_repository()
+        root = self.analyzer.repo_path
+        stamps = {str(file_path.relative_to(root)): (scan.code_mtimes[file_path], scan.code_sizes[file_path])
+                  for file_path in scan.code_files}
+        # Dependency manifests feed the project structure, so their edits count too
+        for rel_path in scan.config_files:
+            try:
+                stat_info = (root / rel_path).stat()
+                stamps[rel_path] = (stat_info.st_mtime_ns, stat_info.st_size)
+            except OSError:
+                pass
+        return scan, stamps
+
+    def save_cache(self):
+        """Write the in-memory analysis cache to disk"""
+        if self.cache:
+            self.cache.save()
+            self.cache_saved = time.perf_counter()
+
+    def update(self, scan: RepositoryScan, stamps: Dict[str, Tuple[int, int]]
+               ) -> Tuple[List[FileInfo], ProjectStructure, ResumableContext]:
+        """Re-analyze new and changed code files, drop deleted ones and rebuild the context"""
+        analyzer = self.analyzer
+        rel_paths = [str(file_path.relative_to(analyzer.repo_path)) for file_path in scan.code_files]
+        stale = {rel_path for rel_path in rel_paths
+                 if rel_path not in self.results or stamps[rel_path] != self.stamps.get(rel_path)}
+        stale_paths = [file_path for file_path, rel_path in zip(scan.code_files, rel_paths) if rel_path in stale]
+        removed = set(self.results) - set(rel_paths)
+        if self.results:
+            print(f"[{datetime.now():%H:%M:%S}] {len(stale)} files changed, {len(removed)} removed")
+        
+        for rel_path in removed:
+            del self.results[rel_path]
+        if self.cache and self.stamps:
+            self.cache.advance()
+        for file_path, result in analyzer.analyze_cached(stale_paths, set(rel_paths) - stale,
+                                                         self.cache, scan.code_sizes):
+            self.results[str(file_path.relative_to(analyzer.repo_path))] = result
+        self.stamps = stamps
+        if self.cache and time.perf_counter() - self.cache_saved >= self.CACHE_SAVE_INTERVAL:
+            self.save_cache()
+        
+        files = []
+        languages = {}
+        total_lines = 0
+        all_frameworks = set()
+        file_imports: Dict[str, Tuple[str, Sequence[str]]] = {}
+        content_hashes: Dict[str, Tuple[str, int]] = {}
+        for rel_path in rel_paths:
+            result = self.results[rel_path]
+            file_info = result.file_info
+            if file_info is None:
+                continue
+            files.append(file_info)
+            languages[file_info.language] = languages.get(file_info.language, 0) + 1
+            total_lines += file_info.lines
+            all_frameworks.update(result.frameworks)
+            file_imports[file_info.path] = (file_info.language,
+                                            result.imports if result.imports is not None else file_info.imports)
+            if result.content_hash:
+                content_hashes[file_info.path] = (result.content_hash, file_info.size)
+        
+        return analyzer.finish_analysis(files, scan, languages, total_lines, all_frameworks, file_imports,
+                                        content_hashes)
+
+
+def query_main(argv: List[str]) -> int:
+    """codebase_analyser.py query ...: look things up in symbol_index.sqlite"""
+    parser = argparse.ArgumentParser(prog='codebase_analyser.py query',
+                                     description='Query the symbol index written by --index')
+    parser.add_argument('--output', '-o', default='ai_analysis',
+                       help='Output directory of the analysis (default: ai_analysis)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    defines = commands.add_parser('defines', help='Files defining a class, function or decorator')
+    defines.add_argument('name', help='Short (method) or qualified (Class.method) name')
+    defines.add_argument('--kind', choices=['class', 'function', 'export', 'decorator'])
+    importers = commands.add_parser('importers', help='Files importing a module or anything inside it')
+    importers.add_argument('module')
+    dependents = commands.add_parser('dependents', help='Files whose imports resolve to a file')
+    dependents.add_argument('path')
+    dependencies = commands.add_parser('dependencies', help='Files a file imports')
+    dependencies.add_argument('path')
+    patterns = commands.add_parser('patterns', help='Files with a key pattern (API_ENDPOINT, DB_MODEL, ...)')
+    patterns.add_argument('kind')
+    patterns.add_argument('value', nargs='?')
+    
+    args = parser.parse_args(argv)
+    index = SymbolIndex(Path(args.output) / SymbolIndex.INDEX_FILE)
+    if not index.path.exists():
+        print(f"Error: no symbol index at {index.path}; run the analysis with --index first")
+        return 1
+    
+    try:
+        started = time.perf_counter()
+        if args.command == 'defines':
+            rows = index.defines(args.name, args.kind)
+        elif args.command == 'importers':
+            rows = index.importers(args.module)
+        elif args.command == 'dependents':
+            rows = index.dependents(args.path)
+        elif args.command == 'dependencies':
+            rows = index.dependencies(args.path)
+        else:
+            rows = index.patterns(args.kind, args.value)
+        elapsed = time.perf_counter() - started
+    except (sqlite3.Error, RuntimeError) as e:
+        print(f"Error querying {index.path}: {e}")
+        return 1
+    
+    for row in rows:
+        print('\t'.join(str(value) for value in row))
+    print(f"{len(rows)} result{'s' if len(rows) != 1 else ''} in {elapsed * 1000:.1f}ms", file=sys.stderr)
+    return 0
+
+
+def create_analyzer(args: argparse.Namespace, repo_path: str, output_dir: str,
+                    summary_budget: Optional[int]) -> CodebaseAnalyzer:
+    """Build an analyzer from the command line options; raises ValueError on a bad --extractor"""
+    analyzer = CodebaseAnalyzer(repo_path, output_dir, workers=args.workers,
+                                use_cache=not args.no_cache, stream=args.stream,
+                                checkpoint_interval=args.checkpoint_interval, resume=args.resume,
+                                profile=args.profile, profile_top=args.profile_top,
+                                max_file_bytes=args.max_file_bytes, file_time_budget=args.file_time_budget,
+                                io_threads=args.io_threads, prefetch_depth=args.prefetch, since=args.since,
+                                summary_budget=summary_budget, dedup=not args.no_dedup)
+    
+    for plugin in args.extractor:
+        language, _, spec = plugin.partition('=')
+        module_name, _, rest = spec.partition(':')
+        class_name, _, cost = rest.partition(':')
+        if language not in analyzer.code_extensions.values():
+            raise ValueError(f"unknown language '{language}' for --extractor")
+        try:
+            analyzer.extractors.register(language, f"{module_name}:{class_name}", cost or 'light')
+        except ValueError as e:
+            raise ValueError(f"invalid --extractor '{plugin}': {e}")
+    return analyzer
+
+
+def run_analysis(analyzer: CodebaseAnalyzer, args: argparse.Namespace):
+    """Analyze one repository and write its outputs"""
+    print("Starting repository analysis...")
+    files, structure, context = analyzer.analyze_repository()
+    
+    if args.summary_only:
+        # Quick summary for immediate AI use
+        with open(analyzer.output_dir / 'ai_summary.md', 'w') as f:
+            f.write(analyzer.generate_ai_summary(context))
+        print(f"AI summary saved to: {analyzer.output_dir}/ai_summary.md")
+    else:
+        # Full analysis
+        analyzer.save_analysis(files, structure, context)
+        if args.index:
+            analyzer.save_symbol_index(files)
+    
+    analyzer.save_timing_report()
+    
+    print(f"✅ Analysis complete! Found {len(files)} files across {len(structure.languages)} languages.")
+    print(f"💡 Use the generated context files to provide comprehensive codebase understanding to AI.")
+
+
+def save_watched(analyzer: CodebaseAnalyzer, args: argparse.Namespace, files: List[FileInfo],
+                 structure: ProjectStructure, context: ResumableContext, announce: bool = True):
+    """Write every output of a watch session; each file (and the index) is replaced atomically"""
+    if args.summary_only:
+        with atomic_open(analyzer.output_dir / 'ai_summary.md') as f:
+            f.write(analyzer.generate_ai_summary(context))
+        return
+    analyzer.save_analysis(files, structure, context, announce)
+    if args.index:
+        analyzer.save_symbol_index(files)
+
+
+def run_watch(analyzer: CodebaseAnalyzer, args: argparse.Namespace) -> int:
+    """Analyze once, then keep every output current until interrupted"""
+    watcher = RepositoryWatcher(analyzer)
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else contextlib.nullcontext()
+    with pool as executor:
+        # One pool for the whole session rather than one per update
+        analyzer.executor = executor
+        
+        print("Starting repository analysis...")
+        scan, stamps = watcher.poll()
+        files, structure, context = watcher.update(scan, stamps)
+        save_watched(analyzer, args, files, structure, context)
+        print(f"Watching {analyzer.repo_path} for changes every {args.watch_interval}s (Ctrl+C to stop)")
         
-        return summary
+        try:
+            while True:
+                time.sleep(args.watch_interval)
+                scan, latest = watcher.poll()
+                if latest == watcher.stamps:
+                    continue
+                # Wait for a burst of saves (or a checkout) to settle before re-analysing
+                while True:
+                    time.sleep(args.debounce)
+                    scan, settled = watcher.poll()
+                    if settled == latest:
+                        break
+                    latest = settled
+                
+                started = time.perf_counter()
+                files, structure, context = watcher.update(scan, latest)
+                save_watched(analyzer, args, files, structure, context, announce=False)
+                print(f"Context updated in {time.perf_counter() - started:.2f}s "
+                      f"({len(files)} files, {structure.total_lines:,} lines)")
+        except KeyboardInterrupt:
+            print("Stopped watching")
+        finally:
+            watcher.save_cache()
+    return 0
+
+
+def load_manifest(manifest_path: Path, output_root: Path) -> List[Tuple[Path, Path]]:
+    """(repository, output directory) pairs from a batch manifest.
+
+    JSON manifests hold a list of {"repo": ..., "output": ...} objects or plain
+    paths; anything else is read as lines of "repo [output]", with # comments.
+    Relative paths are taken from the manifest's directory, and repositories
+    without an output get output_root/<repository name>.
+    """
+    base = manifest_path.parent
+    with open(manifest_path, 'r') as f:
+        text = f.read()
+    
+    raw: List[Tuple[str, Optional[str]]] = []
+    if manifest_path.suffix == '.json':
+        for entry in json.loads(text):
+            if isinstance(entry, str):
+                raw.append((entry, None))
+            else:
+                raw.append((entry['repo'], entry.get('output')))
+    else:
+        for line in text.splitlines():
+            fields = line.split('#', 1)[0].split()
+            if fields:
+                raw.append((fields[0], fields[1] if len(fields) > 1 else None))
+    
+    entries = []
+    used_outputs = set()
+    for repo, output in raw:
+        repo_path = base / Path(repo).expanduser()
+        if output:
+            output_dir = base / Path(output).expanduser()
+        else:
+            output_dir = output_root / repo_path.resolve().name
+            suffix = 2
+            while output_dir in used_outputs:
+                output_dir = output_root / f"{repo_path.resolve().name}-{suffix}"
+                suffix += 1
+        used_outputs.add(output_dir)
+        entries.append((repo_path, output_dir))
+    return entries
+
+
+def run_batch(args: argparse.Namespace, summary_budget: Optional[int]) -> int:
+    """Analyze every repository in the manifest in this process, with one pool and one content cache"""
+    try:
+        entries = load_manifest(Path(args.batch), Path(args.output))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Error: cannot read batch manifest {args.batch}: {e}")
+        return 1
+    
+    Path(args.output).mkdir(parents=True, exist_ok=True)
+    shared_cache_path = Path(args.shared_cache) if args.shared_cache else Path(args.output) / 'shared_content_cache.json'
+    content_cache = None
+    failures = []
+    started = time.perf_counter()
+    
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else contextlib.nullcontext()
+    with pool as executor:
+        for number, (repo_path, output_dir) in enumerate(entries, 1):
+            print(f"\n[{number}/{len(entries)}] {repo_path} -> {output_dir}")
+            if not repo_path.exists():
+                print(f"Error: Repository path '{repo_path}' does not exist")
+                failures.append(str(repo_path))
+                continue
+            try:
+                output_dir.mkdir(parents=True, exist_ok=True)
+                analyzer = create_analyzer(args, str(repo_path), str(output_dir), summary_budget)
+                if not args.no_cache:
+                    if content_cache is None:
+                        content_cache = ContentCache(shared_cache_path, analyzer.cache_settings())
+                    analyzer.content_cache = content_cache
+                analyzer.executor = executor
+                run_analysis(analyzer, args)
+            except Exception as e:
+                print(f"Error during analysis of {repo_path}: {e}")
+                failures.append(str(repo_path))
+    
+    if content_cache is not None:
+        content_cache.save()
+    
+    elapsed = time.perf_counter() - started
+    print(f"\nBatch complete: {len(entries) - len(failures)}/{len(entries)} repositories analyzed in {elapsed:.1f}s")
+    for repo_path in failures:
+        print(f"  failed: {repo_path}")
+    return 1 if failures else 0
 
 
 def main():
-    parser = argparse.ArgumentParser(description='Analyze codebase for AI understanding')
-    parser.add_argument('repo_path', help='Path to the repository to analyze')
+    if sys.argv[1:2] == ['query']:
+        return query_main(sys.argv[2:])
+    
+    parser = argparse.ArgumentParser(description='Analyze codebase for AI understanding '
+                                                 '(or "query --help" to search a symbol index)')
+    parser.add_argument('repo_path', nargs='?', help='Path to the repository to analyze')
     parser.add_argument('--output', '-o', default='ai_analysis', 
                        help='Output directory for analysis results')
     parser.add_argument('--summary-only', action='store_true',
                        help='Generate only the AI summary file')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                       help='Number of worker processes for file analysis (default: 1)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Re-analyze every file instead of reusing the incremental cache')
+    parser.add_argument('--no-dedup', action='store_true',
+                       help='Analyze byte-identical files separately instead of reusing one result')
+    parser.add_argument('--stream', action='store_true',
+                       help='Write files_analysis.ndjson incrementally instead of files_analysis.json')
+    parser.add_argument('--checkpoint-interval', type=int, default=1000,
+                       help='Checkpoint progress every N files (0 disables checkpointing)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Resume an interrupted analysis from its last checkpoint')
+    parser.add_argument('--profile', action='store_true',
+                       help='Time each analysis stage and write timing_report.json')
+    parser.add_argument('--profile-top', type=int, default=10,
+                       help='Number of slowest files to report when profiling (default: 10)')
+    parser.add_argument('--max-file-bytes', type=int, default=2_000_000,
+                       help='Files larger than this get the sampled fast path (0 disables size check, default: 2000000)')
+    parser.add_argument('--file-time-budget', type=float, default=5.0,
+                       help='Seconds per file before finishing on the fast path (0 disables, default: 5)')
+    budget = parser.add_mutually_exclusive_group()
+    budget.add_argument('--summary-bytes', type=int,
+                       help='Fill ai_summary.md by importance up to this many bytes')
+    budget.add_argument('--summary-tokens', type=int,
+                       help=f'Like --summary-bytes, in approximate tokens ({SummaryBuilder.BYTES_PER_TOKEN} bytes each)')
+    parser.add_argument('--index', action='store_true',
+                       help='Also write symbol_index.sqlite for fast "query" lookups')
+    parser.add_argument('--extractor', action='append', default=[], metavar='LANGUAGE=MODULE:CLASS[:COST]',
+                       help='Use a custom extractor class for a language; COST is light, medium or heavy (repeatable)')
+    parser.add_argument('--batch', metavar='MANIFEST',
+                       help='Analyze every repository listed in MANIFEST in one process; outputs default to '
+                            'OUTPUT/<repository name>')
+    parser.add_argument('--shared-cache', metavar='FILE',
+                       help='Content-hash cache shared by batch repositories (default: OUTPUT/shared_content_cache.json)')
+    parser.add_argument('--since', metavar='COMMIT',
+                       help='Re-analyze only files changed since COMMIT (per local git) and patch the previous output')
+    parser.add_argument('--watch', action='store_true',
+                       help='After the analysis, keep the outputs (and --index) current as files change')
+    parser.add_argument('--watch-interval', type=float, default=1.0,
+                       help='Seconds between checks for changes in watch mode (default: 1.0)')
+    parser.add_argument('--debounce', type=float, default=0.5,
+                       help='Seconds without further changes before watch mode re-analyzes (default: 0.5)')
+    parser.add_argument('--io-threads', type=int, default=0,
+                       help='Reader threads keeping file reads in flight, for NFS/SMB checkouts (default: 0, inline reads)')
+    parser.add_argument('--prefetch', type=int, default=32,
+                       help='Maximum number of files read ahead of the extractors (default: 32)')
     
     args = parser.parse_args()
     
+    if bool(args.repo_path) == bool(args.batch):
+        parser.error("give either a repository path or --batch MANIFEST")
+    
+    if args.workers < 1:
+        print("Error: --workers must be at least 1")
+        return 1
+    
+    if args.since and args.resume:
+        print("Error: --since cannot be combined with --resume")
+        return 1
+    
+    if args.watch and (args.batch or args.since or args.resume or args.stream):
+        print("Error: --watch cannot be combined with --batch, --since, --resume or --stream")
+        return 1
+    
+    if args.watch_interval <= 0 or args.debounce < 0:
+        print("Error: --watch-interval must be positive and --debounce non-negative")
+        return 1
+    
+    summary_budget = args.summary_bytes
+    if args.summary_tokens is not None:
+        summary_budget = args.summary_tokens * SummaryBuilder.BYTES_PER_TOKEN
+    if summary_budget is not None and summary_budget < 1:
+        print("Error: the summary budget must be positive")
+        return 1
+    
+    if args.io_threads < 0 or args.prefetch < 1:
+        print("Error: --io-threads must be non-negative and --prefetch at least 1")
+        return 1
+    
+    if args.batch:
+        return run_batch(args, summary_budget)
+    
     if not Path(args.repo_path).exists():
         print(f"Error: Repository path '{args.repo_path}' does not exist")
         return 1
     
-    analyzer = CodebaseAnalyzer(args.repo_path, args.output)
+    try:
+        analyzer = create_analyzer(args, args.repo_path, args.output, summary_budget)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
     
     try:
-        print("Starting repository analysis...")
-        files, structure, context = analyzer.analyze_repository()
-        
-        if args.summary_only:
-            # Quick summary for immediate AI use
-            with open(Path(args.output) / 'ai_summary.md', 'w') as f:
-                f.write(analyzer.generate_ai_summary(context))
-            print(f"AI summary saved to: {args.output}/ai_summary.md")
-        else:
-            # Full analysis
-            analyzer.save_analysis(files, structure, context)
-        
-        print(f"✅ Analysis complete! Found {len(files)} files across {len(structure.languages)} languages.")
-        print(f"💡 Use the generated context files to provide comprehensive codebase understanding to AI.")
-        
+        if args.watch:
+            return run_watch(analyzer, args)
+        run_analysis(analyzer, args)
         return 0
         
     except Exception as e:
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for codebase_analyser.py
+Generates synthetic repositories locally, analyzes them and records comparable timings
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import tempfile
+import platform
+import subprocess
+import argparse
+import contextlib
+import time
+from typing import Dict, List, Optional
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is not reported
+    resource = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from codebase_analyser import AnalysisProfiler, CodebaseAnalyzer
+
+RESULTS_VERSION = 1
+
+DEFAULT_MIX = {'python': 0.5, 'javascript': 0.3, 'typescript': 0.1, 'react': 0.1}
+
+EXTENSIONS = {'python': '.py', 'javascript': '.js', 'typescript': '.ts', 'react': '.jsx'}
+
+
+@dataclass
+class SyntheticRepoSpec:
+    """Shape of a generated repository"""
+    files: int = 1000
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    depth: int = 3  # Directory nesting of ordinary source files
+    files_per_dir: int = 20
+    huge_files: int = 0
+    huge_bytes: int = 4_000_000
+    minified_files: int = 0
+    minified_bytes: int = 500_000
+    node_modules_packages: int = 0
+    files_per_package: int = 10
+    seed: int = 42
+
+
+# Each scenario stresses one part of the pipeline; file counts scale with --scale
+SCENARIOS = {
+    'mixed': SyntheticRepoSpec(files=2000),
+    'python': SyntheticRepoSpec(files=2000, mix={'python': 1.0}),
+    'deep_nesting': SyntheticRepoSpec(files=500, depth=60, files_per_dir=5),
+    'huge_files': SyntheticRepoSpec(files=200, huge_files=4, huge_bytes=8_000_000),
+    'minified_js': SyntheticRepoSpec(files=200, minified_files=20, minified_bytes=1_000_000),
+    'node_modules': SyntheticRepoSpec(files=200, node_modules_packages=2000),
+}
+
+
+class SyntheticRepoGenerator:
+    """Deterministic generator of source trees with cross-file imports"""
+
+    def __init__(self, root: Path, spec: SyntheticRepoSpec):
+        self.root = root
+        self.spec = spec
+        self.random = random.Random(spec.seed)
+        self.python_modules: List[str] = []
+        self.files_written = 0
+        self.bytes_written = 0
+
+    def write(self, rel_path: str, content: str):
+        path = self.root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = content.encode('utf-8')
+        path.write_bytes(data)
+        self.files_written += 1
+        self.bytes_written += len(data)
+
+    def directory_for(self, index: int) -> str:
+        """Spread files over a tree of package directories `depth` levels deep"""
+        dir_index = index // self.spec.files_per_dir
+        parts = [f"pkg{(dir_index // 8 ** level) % 8}" for level in range(self.spec.depth)]
+        return '/'.join(reversed(parts))
+
+    def pick_language(self) -> str:
+        languages = list(self.spec.mix)
+        return self.random.choices(languages, weights=[self.spec.mix[l] for l in languages])[0]
+
+    def python_source(self, index: int) -> str:
+        lines = [f'"""Synthetic module {index}."""', 'import os', 'import json']
+        for module in self.random.sample(self.python_modules, min(3, len(self.python_modules))):
+            lines.append(f"from {module} import helper")
+        lines.append('')
+        for class_index in range(self.random.randint(1, 3)):
+            lines.extend([
+                '',
+                f"class Model{index}_{class_index}(object):",
+                f'    """Model {class_index}."""',
+                '',
+                '    def __init__(self, value):',
+                '        self.value = value',
+                '',
+                '    @property',
+                '    def doubled(self):',
+                '        return self.value * 2',
+                '',
+                '    def process(self, items):',
+                '        total = 0',
+                '        for item in items:',
+                '            if item and item > self.value:',
+                '                total += item',
+                '            elif item is None:',
+                '                continue',
+                '        try:',
+                '            return json.dumps({"total": total})',
+                '        except ValueError:',
+                '            return None',
+            ])
+        for function_index in range(self.random.randint(2, 8)):
+            lines.extend([
+                '',
+                '',
+                f"def helper{'' if function_index == 0 else f'_{function_index}'}(path=None):",
+                '    values = [x for x in range(10) if x % 2]',
+                '    while values:',
+                '        values.pop()',
+                '    return os.path.join(path or ".", str(len(values)))',
+            ])
+        return '\n'.join(lines) + '\n'
+
+    def javascript_source(self, index: int, react: bool, typescript: bool) -> str:
+        lines = []
+        if react:
+            lines.append("import React, { useState } from 'react';")
+        lines.append("const express = require('express');")
+        # Relative imports of earlier files in the same directory (resolved when those are JS too)
+        siblings = range(index - index % self.spec.files_per_dir, index)
+        for sibling in self.random.sample(siblings, min(2, len(siblings))):
+            lines.append(f"import {{ handler{sibling} }} from './module{sibling}';")
+        annotation = ': string' if typescript else ''
+        lines.extend([
+            '',
+            f"export function handler{index}(name{annotation}) {{",
+            "  if (!name) { return null; }",
+            "  for (let i = 0; i < 3; i++) { name = name.trim(); }",
+            "  return fetch('/api/items/' + name).then(r => r.json());",
+            "}",
+            '',
+            f"export const load{index} = async (id) => {{",
+            "  try { return await fetch(`/api/${id}`); } catch (e) { return null; }",
+            "};",
+            '',
+            "const router = express.Router();",
+            f"router.get('/items/{index}', (req, res) => res.json({{ ok: true }}));",
+        ])
+        if react:
+            lines.extend([
+                '',
+                f"export default function Widget{index}() {{",
+                "  const [count, setCount] = useState(0);",
+                "  return <button onClick={() => setCount(count + 1)}>{count}</button>;",
+                "}",
+            ])
+        return '\n'.join(lines) + '\n'
+
+    def minified_source(self, size: int) -> str:
+        unit = "function a(b,c){return b&&c?b+c:typeof b==='string'?b.trim():[b,c].map(function(d){return d*2})};"
+        return unit * (size // len(unit) + 1)
+
+    def huge_source(self, size: int) -> str:
+        # Readable but enormous: many small functions, the worst case for the line-based regexes
+        chunks = []
+        written = 0
+        index = 0
+        while written < size:
+            chunk = (f"def generated_{index}(value):\n"
+                     f"    if value > {index}:\n"
+                     f"        return value - {index}\n"
+                     f"    return value\n\n")
+            chunks.append(chunk)
+            written += len(chunk)
+            index += 1
+        return ''.join(chunks)
+
+    def generate(self) -> Dict[str, int]:
+        """Write the repository and return file and byte counts"""
+        spec = self.spec
+        directories_with_python = set()
+        for index in range(spec.files):
+            directory = self.directory_for(index)
+            language = self.pick_language()
+            rel_path = f"{directory}/module{index}{EXTENSIONS[language]}"
+            if language == 'python':
+                self.write(rel_path, self.python_source(index))
+                directories_with_python.add(directory)
+                self.python_modules.append(rel_path[:-3].replace('/', '.'))
+            else:
+                self.write(rel_path, self.javascript_source(index, language == 'react', language == 'typescript'))
+
+        # Make every directory on the way to a Python file a package, so imports resolve
+        packages = set()
+        for directory in directories_with_python:
+            parts = directory.split('/')
+            packages.update('/'.join(parts[:end]) for end in range(1, len(parts) + 1))
+        for package in sorted(packages):
+            self.write(f"{package}/__init__.py", '')
+
+        for index in range(spec.huge_files):
+            self.write(f"generated/huge{index}.py", self.huge_source(spec.huge_bytes))
+        for index in range(spec.minified_files):
+            self.write(f"static/vendor{index}.js", self.minified_source(spec.minified_bytes))
+        for package in range(spec.node_modules_packages):
+            for index in range(spec.files_per_package):
+                self.write(f"node_modules/package{package}/lib/file{index}.js", self.minified_source(2_000))
+
+        self.write('package.json', json.dumps({'name': 'synthetic', 'dependencies': {'express': '^4.0.0',
+                                                                                       'react': '^18.0.0'}}))
+        self.write('requirements.txt', 'flask==3.0.0\nrequests>=2.0\n')
+        self.write('README.md', '# Synthetic repository\n')
+        return {'files': self.files_written, 'bytes': self.bytes_written}
+
+
+class StageMemoryProfiler(AnalysisProfiler):
+    """AnalysisProfiler that also records the peak RSS reached by the end of each stage"""
+
+    def __init__(self, top_n: int = 10):
+        super().__init__(top_n)
+        self.stage_rss: Dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        # The analysis loop records its time directly, so its peak is read as the next stage starts
+        if 'analyze' in self.stages and 'analyze' not in self.stage_rss:
+            self.stage_rss['analyze'] = peak_rss_mb()
+        with super().stage(name):
+            yield
+        self.stage_rss[name] = peak_rss_mb()
+
+
+def peak_rss_mb(children: bool = False) -> Optional[float]:
+    """Peak resident set size of this process (or its largest child) in MB"""
+    if not children:
+        # VmHWM restarts with each exec; ru_maxrss can carry the parent's peak across fork/exec
+        try:
+            with open('/proc/self/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return round(int(line.split()[1]) / 1024, 1)
+        except OSError:
+            pass
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(usage.ru_maxrss / scale, 1)
+
+
+def measure(repo_path: str, output_dir: str, workers: int, io_threads: int) -> Dict:
+    """Analyze one repository in this process and report time, throughput and memory"""
+    analyzer = CodebaseAnalyzer(repo_path, output_dir, workers=workers, use_cache=False,
+                                checkpoint_interval=0, profile=True, io_threads=io_threads)
+    analyzer.profiler = StageMemoryProfiler()
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        files, structure, context = analyzer.analyze_repository()
+        analyzer.save_analysis(files, structure, context)
+        wall = time.perf_counter() - started
+
+    analyzed_bytes = sum(file_info.size for file_info in files)
+    profiler = analyzer.profiler
+    return {
+        'analyzed_files': len(files),
+        'analyzed_bytes': analyzed_bytes,
+        'wall_seconds': round(wall, 4),
+        'files_per_sec': round(len(files) / wall, 1) if wall > 0 else 0.0,
+        'mb_per_sec': round(analyzed_bytes / (1024 * 1024) / wall, 2) if wall > 0 else 0.0,
+        'peak_rss_mb': peak_rss_mb(),
+        'peak_worker_rss_mb': peak_rss_mb(children=True) if workers > 1 else None,
+        'stages': {name: {'seconds': round(seconds, 4), 'peak_rss_mb': profiler.stage_rss.get(name)}
+                   for name, seconds in profiler.stages.items()}
+    }
+
+
+def run_scenario(repo_path: Path, output_dir: Path, workers: int, io_threads: int) -> Dict:
+    """Measure in a fresh interpreter, so peak RSS is not inherited from earlier scenarios"""
+    command = [sys.executable, str(Path(__file__).resolve()), 'measure', str(repo_path), str(output_dir),
+               '--workers', str(workers), '--io-threads', str(io_threads)]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"measurement failed for {repo_path}: {result.stderr.strip()}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def analyser_revision() -> Optional[str]:
+    """Git revision of the analyser under test, when run from a checkout"""
+    try:
+        result = subprocess.run(['git', '-C', str(Path(__file__).resolve().parent), 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare_results(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Scenarios whose wall time or peak RSS grew by more than `tolerance` (a fraction)"""
+    regressions = []
+    for name, result in current['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        for metric in ('wall_seconds', 'peak_rss_mb'):
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            print(f"  {name:<14} {metric:<14} {old:>10} -> {new:<10} ({change:+.1%})")
+            if change > tolerance:
+                regressions.append(f"{name}: {metric} {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+def scaled(spec: SyntheticRepoSpec, scale: float) -> SyntheticRepoSpec:
+    values = asdict(spec)
+    for key in ('files', 'huge_files', 'minified_files', 'node_modules_packages'):
+        if values[key]:
+            values[key] = max(1, int(values[key] * scale))
+    return SyntheticRepoSpec(**values)
+
+
+def main():
+    if sys.argv[1:2] == ['measure']:
+        # Internal: one measurement in a child interpreter, reported as JSON on stdout
+        parser = argparse.ArgumentParser(prog='codebase_analyser_benchmark.py measure')
+        parser.add_argument('repo_path')
+        parser.add_argument('output_dir')
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--io-threads', type=int, default=0)
+        args = parser.parse_args(sys.argv[2:])
+        print(json.dumps(measure(args.repo_path, args.output_dir, args.workers, args.io_threads)))
+        return 0
+
+    parser = argparse.ArgumentParser(description='Benchmark codebase_analyser.py on synthetic repositories')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                       help='Scenario to run (repeatable, default: all)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                       help='Multiply every scenario\'s file counts (default: 1.0)')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Runs per scenario; the fastest is reported (default: 3)')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                       help='Analyzer worker processes (default: 1)')
+    parser.add_argument('--io-threads', type=int, default=0,
+                       help='Analyzer reader threads (default: 0)')
+    parser.add_argument('--results', default='benchmark_results.json',
+                       help='Where to write the JSON results (default: benchmark_results.json)')
+    parser.add_argument('--compare', metavar='BASELINE',
+                       help='Earlier results file to compare against; exits 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                       help='Allowed slowdown or memory growth before a regression is reported (default: 0.10)')
+    parser.add_argument('--work-dir',
+                       help='Generate repositories here and keep them (default: a temporary directory)')
+
+    args = parser.parse_args()
+
+    if args.repeat < 1 or args.scale <= 0:
+        print("Error: --repeat must be at least 1 and --scale positive")
+        return 1
+
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix='analyser_bench_'))
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    results = {
+        'version': RESULTS_VERSION,
+        'timestamp': datetime.now().isoformat(),
+        'analyser_revision': analyser_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'scale': args.scale, 'repeat': args.repeat, 'workers': args.workers,
+                     'io_threads': args.io_threads},
+        'scenarios': {}
+    }
+
+    try:
+        for name in args.scenario or sorted(SCENARIOS):
+            spec = scaled(SCENARIOS[name], args.scale)
+            repo_path = work_dir / name
+            if repo_path.exists():
+                shutil.rmtree(repo_path)
+            generated = SyntheticRepoGenerator(repo_path, spec).generate()
+            print(f"{name}: generated {generated['files']} files ({generated['bytes'] / (1024 * 1024):.1f} MB)")
+
+            runs = []
+            for run in range(args.repeat):
+                output_dir = work_dir / f"{name}_output"
+                if output_dir.exists():
+                    shutil.rmtree(output_dir)
+                runs.append(run_scenario(repo_path, output_dir, args.workers, args.io_threads))
+            best = min(runs, key=lambda r: r['wall_seconds'])
+            best['generated'] = dict(generated, spec=asdict(spec))
+            best['runs_wall_seconds'] = [r['wall_seconds'] for r in runs]
+            results['scenarios'][name] = best
+            print(f"  {best['wall_seconds']:.3f}s, {best['files_per_sec']} files/sec, "
+                  f"{best['mb_per_sec']} MB/sec, peak RSS {best['peak_rss_mb']} MB")
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.results, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {args.results}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare} (revision {baseline.get('analyser_revision')}):")
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print("Regressions beyond tolerance:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())